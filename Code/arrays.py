@@ -0,0 +1,188 @@
+"""
+An array of supernumbers sharing one modulus and multiplier, stored as a NumPy
+integer array so that arithmetic happens a whole array at a time.
+"""
+
+import numpy as np
+
+from backend import GetBackend, SelectBackend
+from core import SuperNumber, SuperNumbers
+
+
+class SuperNumberArray:
+    """
+    Represents many supernumbers with the same modulus (aka n) and multiplier
+    (aka alpha), held as an integer ndarray of their values. That's int64
+    or, for moduli too large for it, an ndarray of Python ints, depending on
+    the backend.
+    """
+
+    def __init__(self, values, mod, mult, backend=None):
+        """
+        Create an array from integer values, a modulus and a multiplier. As
+        with SuperNumber, values and the multiplier are reduced modulo the
+        modulus. backend is the name of the backend to multiply with; by
+        default SelectBackend chooses.
+        """
+        values = np.asarray(values)
+        if values.size and not (
+            np.issubdtype(values.dtype, np.integer)
+            or values.dtype == object
+            and all(type(x) is int for x in values.flat)
+        ):
+            raise TypeError("Values are not ints.")
+        if values.size and values.min() < 0:
+            raise Exception("Values are not greater than zero.")
+        if not type(mod) is int:
+            raise TypeError("Modulus is not an int.")
+        if mod <= 0:
+            raise Exception("Modulus is not greater than zero.")
+        if not type(mult) is int:
+            raise TypeError("Multiplier is not an int.")
+        if mult < 0:
+            raise Exception("Multiplier is not greater than zero.")
+        self.backend = SelectBackend(mod) if backend is None else GetBackend(backend)
+        if not self.backend.vectorized:
+            raise ValueError(f"The {self.backend.name} backend can't hold arrays.")
+        self.values = self.backend.asarray(values) % mod
+        self.multiplier = mult % mod
+        self.modulus = mod
+
+    @classmethod
+    def from_supernumbers(cls, sns):
+        """
+        Create an array holding every supernumber in a SuperNumbers set, in
+        iteration order.
+        """
+        return cls(
+            np.arange(sns.size(), dtype=np.int64),
+            sns.modulus,
+            sns.multiplier,
+            sns.backend,
+        )
+
+    @classmethod
+    def from_list(cls, sns):
+        """
+        Create an array from a non-empty list of supernumbers, all of which
+        must share the same modulus and multiplier.
+        """
+        sns = list(sns)
+        if len(sns) == 0:
+            raise ValueError("SuperNumberArray.from_list called on empty list")
+        first = sns[0]
+        if not all(
+            sn.modulus == first.modulus and sn.multiplier == first.multiplier
+            for sn in sns
+        ):
+            raise ValueError("Mismatched list passed to SuperNumberArray.from_list")
+        return cls([sn.object for sn in sns], first.modulus, first.multiplier)
+
+    def __repr__(self):
+        """
+        Formats and prints a readable array of supernumbers.
+        """
+        return (
+            f"<SuperNumberArray {self.values.tolist()} mod {self.modulus} "
+            f"| {self.multiplier}>"
+        )
+
+    def __len__(self):
+        """
+        Returns the number of supernumbers along the first axis.
+        """
+        return len(self.values)
+
+    def __getitem__(self, key):
+        """
+        Index the array as NumPy would. A single element comes back as a
+        SuperNumber, anything else as a SuperNumberArray.
+        """
+        values = self.values[key]
+        if np.ndim(values) == 0:
+            return SuperNumber(int(values), self.modulus, self.multiplier)
+        return SuperNumberArray(values, self.modulus, self.multiplier, self.backend)
+
+    def _compatible_values(self, other):
+        """
+        Return the values of another array or supernumber, making sure it has
+        the same modulus and multiplier as this array.
+        """
+        if self.multiplier != other.multiplier or self.modulus != other.modulus:
+            raise Exception("Modulus and multiplier are not the same.")
+        if isinstance(other, SuperNumberArray):
+            return other.values
+        return other.object
+
+    def __mul__(self, other):
+        """
+        Multiplies elementwise with another array, or every element by a
+        single supernumber.
+        """
+        return SuperNumberArray(
+            self.backend.product(
+                self.values,
+                self._compatible_values(other),
+                self.modulus,
+                self.multiplier,
+            ),
+            self.modulus,
+            self.multiplier,
+            self.backend,
+        )
+
+    def outer(self, other):
+        """
+        Return the array of every product x * y, with x drawn from this array
+        and y from other, indexed [x, y].
+        """
+        other = self.backend.asarray(self._compatible_values(other))
+        return SuperNumberArray(
+            self.backend.product(
+                self.values[..., np.newaxis],
+                other[np.newaxis, ...],
+                self.modulus,
+                self.multiplier,
+            ),
+            self.modulus,
+            self.multiplier,
+            self.backend,
+        )
+
+    def __eq__(self, other):
+        """
+        Returns a boolean mask of where this array equals another array or
+        supernumber. Supernumbers with a different modulus or multiplier are
+        never equal.
+        """
+        if self.multiplier != other.multiplier or self.modulus != other.modulus:
+            return np.zeros(self.values.shape, dtype=bool)
+        if isinstance(other, SuperNumberArray):
+            return self.values == other.values
+        return self.values == other.object
+
+    # An array-valued __eq__ can't be hashed consistently.
+    __hash__ = None
+
+    def unique(self):
+        """
+        Returns the distinct supernumbers in this array, in increasing order.
+        """
+        return SuperNumberArray(
+            np.unique(self.values), self.modulus, self.multiplier, self.backend
+        )
+
+    def to_list(self):
+        """
+        Returns the supernumbers in this (flattened) array as a list.
+        """
+        return [
+            SuperNumber(x, self.modulus, self.multiplier)
+            for x in self.values.ravel().tolist()
+        ]
+
+    def supernumbers(self):
+        """
+        Returns the SuperNumbers set every element of this array belongs to.
+        """
+        return SuperNumbers(self.modulus, self.multiplier, backend=self.backend.name)
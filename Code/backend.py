@@ -0,0 +1,156 @@
+"""
+Provides the backends that do supernumber arithmetic, and chooses between them
+for a given n:
+
+- "python": plain Python ints, one product at a time. Always correct, and
+  what SuperNumber itself uses.
+- "numpy": int64 NumPy arrays, a whole array at a time. Products are reduced
+  as they go so nothing overflows, as long as n < 2^62.
+- "object": NumPy arrays of Python ints, a whole array at a time, for any n.
+
+x * y = x + y + alpha*x*y needs alpha*x*y reduced mod n without overflowing.
+Reducing alpha*x first leaves a product of two values below n, which fits in
+an int64 for n up to about 3*10^9. Above that, the numpy backend multiplies
+by a few bits of y at a time (see _mulmod), which works for n < 2^62.
+"""
+
+import numpy as np
+
+# The largest n for which (n - 1)^2 + 2(n - 1) fits in an int64, so x * y can
+# be worked out directly.
+DIRECT_LIMIT = 3037000499
+
+# Below this, the sum of two values always fits in an int64.
+INT64_LIMIT = 2 ** 62
+
+
+class PythonBackend:
+    """
+    Multiplies supernumber values held as Python ints, one at a time.
+    """
+
+    name = "python"
+    vectorized = False
+
+    def __repr__(self):
+        """
+        Formats and prints a readable backend.
+        """
+        return f"<{type(self).__name__} {self.name}>"
+
+    def asarray(self, value):
+        """
+        Return a value as a Python int.
+        """
+        return int(value)
+
+    def product(self, x, y, mod, mult):
+        """
+        Multiply two supernumber values.
+        """
+        return (x + y + mult * x * y) % mod
+
+
+class ObjectBackend(PythonBackend):
+    """
+    Multiplies arrays of supernumber values held as Python ints, elementwise
+    and broadcasting as NumPy would, for any n.
+    """
+
+    name = "object"
+    vectorized = True
+
+    def asarray(self, values):
+        """
+        Return values as an array of Python ints.
+        """
+        return np.asarray(values).astype(object)
+
+    def product(self, x, y, mod, mult):
+        """
+        Multiply two arrays (or an array and an integer) of supernumber
+        values elementwise.
+        """
+        x = self.asarray(x)
+        y = self.asarray(y)
+        return (x + y + ((mult * x) % mod) * y) % mod
+
+
+def _mulmod(a, b, mod):
+    """
+    Return a * b % mod elementwise for int64 arrays of values below
+    mod < 2^62. b is split into k-bit pieces, with k as large as it can be
+    while a * (a piece) still fits in an int64, and the pieces are combined
+    the way long multiplication would: k = 23 needs two steps for n ≈ 10^12,
+    n below 2^61 needs at most 31, and n just below 2^62, with k = 1,
+    needs 62.
+    """
+    bits = mod.bit_length()
+    k = 63 - bits
+    mask = (1 << k) - 1
+    result = np.zeros(np.broadcast(a, b).shape, dtype=np.int64)
+    for shift in reversed(range(0, bits, k)):
+        piece = (b >> shift) & mask
+        result = ((result << k) % mod + a * piece % mod) % mod
+    return result
+
+
+class NumPyBackend(ObjectBackend):
+    """
+    Multiplies int64 arrays of supernumber values, elementwise and
+    broadcasting as NumPy would, for n < 2^62.
+    """
+
+    name = "numpy"
+
+    def asarray(self, values):
+        """
+        Return values as an int64 array.
+        """
+        return np.asarray(values, dtype=np.int64)
+
+    def product(self, x, y, mod, mult):
+        """
+        Multiply two arrays (or an array and an integer) of supernumber
+        values elementwise.
+        """
+        if mod >= INT64_LIMIT:
+            raise OverflowError(f"The numpy backend can't multiply mod {mod}.")
+        x = self.asarray(x)
+        y = self.asarray(y)
+        mult %= mod
+        if mod <= DIRECT_LIMIT:
+            # The multiplier is applied to x and reduced before multiplying
+            # by y, so no intermediate value exceeds n squared.
+            return (x + y + ((mult * x) % mod) * y) % mod
+        xy = _mulmod(_mulmod(np.int64(mult), x, mod), y, mod)
+        return ((x + y) % mod + xy) % mod
+
+
+BACKENDS = {
+    backend.name: backend
+    for backend in (PythonBackend(), NumPyBackend(), ObjectBackend())
+}
+
+
+def GetBackend(backend):
+    """
+    Return the backend with the given name. A backend is returned as it is.
+    """
+    if isinstance(backend, PythonBackend):
+        return backend
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown backend {backend}")
+    return BACKENDS[backend]
+
+
+def SelectBackend(mod, vectorized=True):
+    """
+    Return the fastest backend that multiplies correctly mod n: numpy while
+    n < 2^62 and object above that, or python if vectorized is false.
+    """
+    if not vectorized:
+        return BACKENDS["python"]
+    if mod < INT64_LIMIT:
+        return BACKENDS["numpy"]
+    return BACKENDS["object"]
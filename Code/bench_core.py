@@ -0,0 +1,109 @@
+"""
+Micro-benchmark of SuperNumber multiplication and memory use per instance.
+
+Compares the current SuperNumber against a copy of the original one, which
+stored its fields in an instance dict and returned every product through the
+validating constructor. Run with:
+
+$ python3 bench_core.py
+"""
+
+import timeit
+import tracemalloc
+
+from core import SuperNumber, SuperNumbers
+
+
+class LegacySuperNumber:
+    """
+    SuperNumber as it was before __slots__ and the trusted constructor, kept
+    only as a baseline to measure against.
+    """
+
+    def __init__(self, obj, mod, mult):
+        """
+        Create a supernumber, validating every argument.
+        """
+        if not type(obj) is int:
+            raise TypeError("Num is not an int.")
+        if obj < 0:
+            raise Exception("Num is not greater than zero.")
+        if not type(mod) is int:
+            raise TypeError("Modulus is not an int.")
+        if mod < 0:
+            raise Exception("Modulus is not greater than zero.")
+        if not type(mult) is int:
+            raise TypeError("Multiplier is not an int.")
+        if mult < 0:
+            raise Exception("Multiplier is not greater than zero.")
+        self.object = obj % mod
+        self.multiplier = mult % mod
+        self.modulus = mod
+
+    def __mul__(self, other):
+        """
+        Multiplies through the validating constructor.
+        """
+        if self.multiplier == other.multiplier and self.modulus == other.modulus:
+            return LegacySuperNumber(
+                (
+                    self.object
+                    + other.object
+                    + (self.multiplier * self.object * other.object)
+                )
+                % self.modulus,
+                self.modulus,
+                self.multiplier,
+            )
+        else:
+            raise Exception("Modulus and multiplier are not the same.")
+
+
+def time_per_multiply(cls, number=200000):
+    """
+    Return the best time in nanoseconds for a single multiplication.
+    """
+    x = cls(123, 1009, 7)
+    y = cls(456, 1009, 7)
+    best = min(timeit.repeat(lambda: x * y, number=number, repeat=5))
+    return best / number * 1e9
+
+
+def bytes_per_instance(make, count=100000):
+    """
+    Return the memory in bytes allocated per supernumber created by make.
+    """
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    instances = [make(x) for x in range(count)]
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    # Don't count the list holding them.
+    return (after - before) / len(instances) - 8
+
+
+def main():
+    """
+    Print the results of every benchmark.
+    """
+    print(f"multiply, legacy:    {time_per_multiply(LegacySuperNumber):6.0f} ns")
+    print(f"multiply, current:   {time_per_multiply(SuperNumber):6.0f} ns")
+    print(
+        "instance, legacy:    "
+        f"{bytes_per_instance(lambda x: LegacySuperNumber(x, 10**6, 7)):6.0f} bytes"
+    )
+    print(
+        "instance, current:   "
+        f"{bytes_per_instance(lambda x: SuperNumber(x, 10**6, 7)):6.0f} bytes"
+    )
+
+    sns = SuperNumbers(1000, 7)
+    interned = SuperNumbers(1000, 7, interned=True)
+    list(interned)
+    for name, s in [("fresh", sns), ("interned", interned)]:
+        best = min(timeit.repeat(lambda: list(s), number=200, repeat=5))
+        print(f"iterate, {name + ':':12} {best / 200 * 1e6:6.0f} µs")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,160 @@
+"""
+Benchmarks for core arithmetic, the property functions and spans, across a
+range of n. Results are saved as JSON, and two runs can be compared to find
+regressions:
+
+$ python3 benchmarks.py run -o before.json
+$ python3 benchmarks.py run -o after.json
+$ python3 benchmarks.py compare before.json after.json
+"""
+
+import argparse
+import json
+import platform
+import sys
+import timeit
+
+import props
+import props_checked
+import props_supernumbers
+import span
+from core import SuperNumber, SuperNumbers
+from sweep import PROPERTIES
+
+DEFAULT_SIZES = (10, 20, 40)
+
+PROPERTY_MODULES = (props, props_supernumbers, props_checked)
+
+PROPERTY_NAMES = tuple(PROPERTIES)
+
+
+def _spanWithoutCache(generators):
+    """
+    Calculate a span from scratch, without any help from SuperNumberSetSpan's
+    caches.
+    """
+    span.ClearSpanCache()
+    span._assertCommutative.cache_clear()
+    return span.SuperNumberSetSpan(generators)
+
+
+def Benchmarks(sizes=DEFAULT_SIZES):
+    """
+    Return a dict of benchmark name -> function to time, for each n in sizes.
+    """
+
+    benchmarks = {}
+    for n in sizes:
+        alpha = 3 % n
+        x = SuperNumber(n // 2, n, alpha)
+        y = SuperNumber(n // 3, n, alpha)
+        sns = SuperNumbers(n, alpha)
+
+        benchmarks[f"core.multiply[n={n}]"] = lambda x=x, y=y: x * y
+        benchmarks[f"core.iterate[n={n}]"] = lambda sns=sns: list(sns)
+        for module in PROPERTY_MODULES:
+            for name in PROPERTY_NAMES:
+                # Time the computation itself, not a lookup in the memo cache.
+                fn = getattr(module, name)
+                fn = getattr(fn, "__wrapped__", fn)
+                benchmarks[f"{module.__name__}.{name}[n={n}]"] = (
+                    lambda fn=fn, n=n, alpha=alpha: fn(n, alpha)
+                )
+        benchmarks[f"span.SuperNumberSetSpan[n={n}]"] = (
+            lambda generators={x, y}: _spanWithoutCache(generators)
+        )
+    return benchmarks
+
+
+def _time(fn, repeat):
+    """
+    Return the best time in seconds for one call of fn, over repeat runs of
+    enough calls to take at least 0.2 seconds.
+    """
+    timer = timeit.Timer(fn)
+    number, _ = timer.autorange()
+    return min(timer.repeat(repeat=repeat, number=number)) / number
+
+
+def RunBenchmarks(sizes=DEFAULT_SIZES, pattern="", repeat=3, verbose=False):
+    """
+    Time every benchmark whose name contains pattern, returning a dict that
+    can be saved as JSON, with the time per call of each benchmark in seconds
+    under "results".
+    """
+
+    results = {}
+    for name, fn in Benchmarks(sizes).items():
+        if pattern in name:
+            results[name] = _time(fn, repeat)
+            if verbose:
+                print(f"{name}: {results[name] * 1e6:.1f} µs", file=sys.stderr)
+
+    return {
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "results": results,
+    }
+
+
+def CompareBenchmarks(before, after, threshold=0.1):
+    """
+    Compare two sets of results from RunBenchmarks, returning a list of
+    (name, time before, time after, ratio) for every benchmark in both whose
+    time has gone up by more than threshold (as a fraction).
+    """
+
+    regressions = []
+    for name, old in before["results"].items():
+        new = after["results"].get(name)
+        if new is not None and new > old * (1 + threshold):
+            regressions.append((name, old, new, new / old))
+    return regressions
+
+
+def main(argv=None):
+    """
+    Run or compare benchmarks from the command line.
+    """
+    parser = argparse.ArgumentParser(prog="python3 benchmarks.py")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run = commands.add_parser("run", help="run benchmarks and save the results")
+    run.add_argument("-o", "--output", help="file to save JSON results to")
+    run.add_argument(
+        "--sizes", type=int, nargs="+", default=DEFAULT_SIZES, help="values of n"
+    )
+    run.add_argument("--pattern", default="", help="only run matching benchmarks")
+
+    compare = commands.add_parser("compare", help="compare two saved runs")
+    compare.add_argument("before")
+    compare.add_argument("after")
+    compare.add_argument(
+        "--threshold",
+        type=float,
+        default=0.1,
+        help="slowdown to report, as a fraction (default: 0.1)",
+    )
+
+    args = parser.parse_args(argv)
+    if args.command == "run":
+        results = RunBenchmarks(args.sizes, args.pattern, verbose=True)
+        if args.output:
+            with open(args.output, "w") as f:
+                json.dump(results, f, indent=2)
+        else:
+            json.dump(results, sys.stdout, indent=2)
+        return 0
+
+    with open(args.before) as f:
+        before = json.load(f)
+    with open(args.after) as f:
+        after = json.load(f)
+    regressions = CompareBenchmarks(before, after, args.threshold)
+    for name, old, new, ratio in regressions:
+        print(f"{name}: {old * 1e6:.1f} µs -> {new * 1e6:.1f} µs ({ratio:.2f}x)")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,106 @@
+"""
+The command line interface, run with python3 -m supernumber.
+"""
+
+import argparse
+import sys
+
+from server import Serve
+from store import ResultsStore
+from sweep import PROPERTIES, Grid, Sweep, WriteJSONL
+
+
+def _range(text):
+    """
+    Parse a range of integers given as "a-b" (inclusive) or as a single "a".
+    """
+    start, _, stop = text.partition("-")
+    return range(int(start), int(stop or start) + 1)
+
+
+def _sweep(args):
+    """
+    Run a sweep, writing JSONL to stdout.
+    """
+    grid = Grid(args.n, args.alpha)
+    results = Sweep(
+        grid,
+        properties=args.property or tuple(PROPERTIES),
+        processes=args.processes,
+        props=args.props,
+        store=None if args.store is None else ResultsStore(args.store),
+        tables=args.tables,
+    )
+    WriteJSONL(results, sys.stdout)
+
+
+def _serve(args):
+    """
+    Run a query server until interrupted.
+    """
+    Serve(
+        args.socket,
+        port=args.port,
+        cache_size=args.cache_size,
+        processes=args.processes,
+        props=args.props,
+    )
+
+
+def main(argv=None):
+    """
+    Parse the command line and run the requested command.
+    """
+    parser = argparse.ArgumentParser(prog="python3 -m supernumber")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    sweep = commands.add_parser(
+        "sweep", help="run properties over a grid of (n, alpha), printing JSONL"
+    )
+    sweep.add_argument(
+        "--n", type=_range, required=True, help="values of n, e.g. 1-200"
+    )
+    sweep.add_argument(
+        "--alpha", type=_range, help="values of alpha, e.g. 0-5 (default: all)"
+    )
+    sweep.add_argument(
+        "--property",
+        action="append",
+        choices=tuple(PROPERTIES),
+        help="property to run; may be repeated (default: all)",
+    )
+    sweep.add_argument("--processes", type=int, help="worker processes")
+    sweep.add_argument(
+        "--props", default="props_table", help="module to take properties from"
+    )
+    sweep.add_argument(
+        "--store", help="directory to record results in and resume from"
+    )
+    sweep.add_argument(
+        "--tables",
+        action="store_true",
+        help="run properties against the store's memory-mapped tables",
+    )
+    sweep.set_defaults(run=_sweep)
+
+    serve = commands.add_parser(
+        "serve", help="answer queries over a Unix socket or localhost"
+    )
+    serve.add_argument("--socket", help="path of a Unix socket to listen on")
+    serve.add_argument(
+        "--port",
+        type=int,
+        default=0,
+        help="localhost port to listen on, if --socket isn't given (default: any)",
+    )
+    serve.add_argument(
+        "--cache-size", type=int, default=1024, help="number of results to keep"
+    )
+    serve.add_argument("--processes", type=int, help="worker processes")
+    serve.add_argument(
+        "--props", default="props_table", help="module to take properties from"
+    )
+    serve.set_defaults(run=_serve)
+
+    args = parser.parse_args(argv)
+    args.run(args)
@@ -0,0 +1,124 @@
+"""
+Provides a thin client for the query server in server.py, with the same
+functions as supernumber.py:
+
+>>> from client import QueryClient
+>>> with QueryClient("/tmp/supernumber.sock") as client:
+...     client.SuperRootsOfOne(10, 3)
+[<7 mod 10 | 3>, <9 mod 10 | 3>]
+"""
+
+import itertools
+import json
+import socket
+
+from core import SuperNumber
+from span import CheckGenerators
+
+
+class QueryClient:
+    """
+    A connection to a query server, on the Unix socket at path if it's
+    given, and otherwise on host and port. Requests are sent one at a time.
+    """
+
+    def __init__(self, path=None, host="127.0.0.1", port=None):
+        """
+        Connect to the server.
+        """
+        if path is not None:
+            self._socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            self._socket.connect(path)
+        else:
+            self._socket = socket.create_connection((host, port))
+        self._file = self._socket.makefile("rwb")
+        self._ids = itertools.count(1)
+
+    def __enter__(self):
+        """
+        Use the client as a context manager, closing it at the end.
+        """
+        return self
+
+    def __exit__(self, *exc):
+        """
+        Close the connection.
+        """
+        self.close()
+        return False
+
+    def close(self):
+        """
+        Close the connection.
+        """
+        self._file.close()
+        self._socket.close()
+
+    def call(self, method, n=None, alpha=None, **params):
+        """
+        Send one request and return the result, raising an Exception with the
+        server's message if it sent back an error.
+        """
+        request = dict(params, id=next(self._ids), method=method)
+        if n is not None:
+            request["n"] = n
+            request["alpha"] = alpha
+        self._file.write(json.dumps(request).encode() + b"\n")
+        self._file.flush()
+
+        line = self._file.readline()
+        if not line:
+            raise Exception("The server closed the connection.")
+        reply = json.loads(line)
+        if "error" in reply:
+            raise Exception(reply["error"])
+        return reply["result"]
+
+    def stats(self):
+        """
+        Returns the server's counters.
+        """
+        return self.call("stats")
+
+    def HasSuperNumberIdempotentProperty(self, n, alpha):
+        """
+        Checks on the server whether x * x = x for all supernumbers.
+        """
+        return self.call("HasSuperNumberIdempotentProperty", n, alpha)
+
+    def IsCommutativeSuperNumberMultiplication(self, n, alpha):
+        """
+        Checks on the server whether x * y = y * x for all supernumbers.
+        """
+        return self.call("IsCommutativeSuperNumberMultiplication", n, alpha)
+
+    def IsAssociativeSuperNumberMultiplication(self, n, alpha):
+        """
+        Checks on the server whether (x * y) * z = x * (y * z) for all
+        supernumbers.
+        """
+        return self.call("IsAssociativeSuperNumberMultiplication", n, alpha)
+
+    def SuperRootsOfOne(self, n, alpha):
+        """
+        Calculates on the server the list of all elements that satisfy
+        x * x = 1.
+        """
+        values = self.call("SuperRootsOfOne", n, alpha)
+        return [SuperNumber(x, n, alpha) for x in values]
+
+    def SuperNumberSetSpan(self, generators):
+        """
+        Calculate the span of a set of "generator" supernumbers on the
+        server. Like span.SuperNumberSetSpan, raises ValueError if the set is
+        empty or its supernumbers don't all have the same n and alpha.
+        """
+        first = CheckGenerators(generators, "SuperNumberSetSpan")
+        n, alpha = first.modulus, first.multiplier
+        values = self.call(
+            "SuperNumberSetSpan",
+            n,
+            alpha,
+            generators=[sn.object for sn in generators],
+        )
+        return {SuperNumber(x, n, alpha) for x in values}
@@ -0,0 +1,181 @@
+"""
+Provides functions to solve the quadratic congruences behind x * x = c, which
+scale to huge moduli by solving modulo each prime power dividing n and
+combining the answers with the Chinese Remainder Theorem.
+
+For supernumbers x * x = alpha*x² + 2x, so x * x = c when
+alpha*x² + 2x - c ≡ 0 (mod n), and x is idempotent when alpha*x² + x ≡ 0.
+"""
+
+import props
+from core import SuperNumber
+from primes import Factorize
+
+# Below this, roots modulo a prime are found by trying every residue.
+_BRUTE_FORCE_PRIME = 64
+
+
+def _sqrtModPrime(d, p):
+    """
+    Return a square root of d modulo an odd prime p, or None if there isn't
+    one, using the Tonelli-Shanks algorithm.
+    """
+
+    d %= p
+    if d == 0:
+        return 0
+    if pow(d, (p - 1) // 2, p) != 1:
+        return None
+
+    q, s = p - 1, 0
+    while q % 2 == 0:
+        q //= 2
+        s += 1
+    z = 2
+    while pow(z, (p - 1) // 2, p) != p - 1:
+        z += 1
+
+    m, c, t, r = s, pow(z, q, p), pow(d, q, p), pow(d, (q + 1) // 2, p)
+    while t != 1:
+        i, t2 = 0, t
+        while t2 != 1:
+            t2 = t2 * t2 % p
+            i += 1
+        b = pow(c, 1 << (m - i - 1), p)
+        m, c, t, r = i, b * b % p, t * b * b % p, r * b % p
+    return r
+
+
+def _rootsModPrime(a, b, c, p):
+    """
+    Return the roots of a*x² + b*x + c modulo the prime p.
+    """
+
+    a, b, c = a % p, b % p, c % p
+    if p < _BRUTE_FORCE_PRIME:
+        return [x for x in range(p) if (a * x * x + b * x + c) % p == 0]
+
+    if a == 0:
+        if b == 0:
+            return list(range(p)) if c == 0 else []
+        return [-c * pow(b, -1, p) % p]
+
+    root = _sqrtModPrime(b * b - 4 * a * c, p)
+    if root is None:
+        return []
+    inverse = pow(2 * a, -1, p)
+    return sorted({(-b + root) * inverse % p, (-b - root) * inverse % p})
+
+
+def _rootsModPrimePower(a, b, c, p, k):
+    """
+    Return the roots of a*x² + b*x + c modulo p^k, by lifting the roots
+    modulo p one power of p at a time.
+
+    Writing f for the polynomial, f(r + t·p^j) ≡ f(r) + t·p^j·f'(r) modulo
+    p^(j+1). Where f'(r) is a unit mod p there's exactly one t that makes this
+    zero (Hensel's lemma); otherwise either every t does, or none.
+    """
+
+    roots = _rootsModPrime(a, b, c, p)
+    pj = p
+    for _ in range(k - 1):
+        lifted = []
+        for r in roots:
+            f = a * r * r + b * r + c
+            slope = (2 * a * r + b) % p
+            if slope:
+                t = -(f // pj) * pow(slope, -1, p) % p
+                lifted.append(r + t * pj)
+            elif f % (pj * p) == 0:
+                lifted.extend(r + t * pj for t in range(p))
+        roots = lifted
+        pj *= p
+    return roots
+
+
+def CombineResidues(residues, moduli):
+    """
+    Given a list of roots modulo each of some pairwise coprime moduli, return
+    every number modulo their product with one of the roots for each, using
+    the Chinese Remainder Theorem.
+    """
+
+    results, m = [0], 1
+    for roots, modulus in zip(residues, moduli):
+        inverse = pow(m, -1, modulus)
+        results = [
+            x + m * ((r - x) * inverse % modulus) for x in results for r in roots
+        ]
+        m *= modulus
+    return results
+
+
+def SolveQuadraticCongruence(a, b, c, n):
+    """
+    Return every x in [0, n) for which a*x² + b*x + c ≡ 0 (mod n), in
+    increasing order.
+    """
+
+    factors = Factorize(n)
+    residues = [_rootsModPrimePower(a, b, c, p, k) for p, k in factors.items()]
+    moduli = [p ** k for p, k in factors.items()]
+    return sorted(CombineResidues(residues, moduli))
+
+
+def SuperNumberSquareRoots(n, alpha, c):
+    """
+    Calculates for given n and alpha the list of all elements that satisfy
+    x * x = c, where c is a supernumber or an int.
+    """
+
+    if isinstance(c, SuperNumber):
+        c = c.object
+    return [
+        SuperNumber(x, n, alpha) for x in SolveQuadraticCongruence(alpha, 2, -c, n)
+    ]
+
+
+def SuperRootsOfOne(n, alpha, validate=False):
+    """
+    Calculates for given n and alpha the list of all elements that satisfy
+    x * x = 1. If validate is true, the answer is also computed by brute
+    force, and the two are asserted to be equal.
+    """
+
+    roots = SuperNumberSquareRoots(n, alpha, 1)
+    if validate:
+        assert roots == props.SuperRootsOfOne(n, alpha)
+    return roots
+
+
+def SuperNumberIdempotents(n, alpha):
+    """
+    Calculates for given n and alpha the list of all elements that satisfy
+    x * x = x
+    """
+
+    return [
+        SuperNumber(x, n, alpha) for x in SolveQuadraticCongruence(alpha, 1, 0, n)
+    ]
+
+
+def HasSuperNumberIdempotentProperty(n, alpha, validate=False):
+    """
+    Checks for given n and alpha whether the equality x * x = x holds for all
+    supernumbers. If validate is true, the answer is also computed by brute
+    force, and the two are asserted to be equal.
+
+    This holds when every residue modulo every prime power p^k dividing n is
+    a root of alpha*x² + x. A residue mod p^k is only a root if it is one mod
+    p, so as soon as some residue mod p isn't, the answer is no.
+    """
+
+    result = all(
+        len(_rootsModPrime(alpha, 1, 0, p)) == p
+        and len(_rootsModPrimePower(alpha, 1, 0, p, k)) == p ** k
+        for p, k in Factorize(n).items()
+    )
+    if validate:
+        assert result == props.HasSuperNumberIdempotentProperty(n, alpha)
+    return result
@@ -2,6 +2,27 @@
 The core implementation of SuperNumber and SuperNumbers.
 """
 
+from collections import OrderedDict
+
+from cyclic import CyclicStructure, SuperNumberPower
+
+# Used to create supernumbers without going through __init__.
+_new = object.__new__
+
+INTERN_POOL_COUNT = 64
+
+# Canonical supernumbers handed out by interned SuperNumbers sets, as a dict of
+# value -> instance for each of the most recently used INTERN_POOL_COUNT
+# (modulus, multiplier).
+_intern_pools = OrderedDict()
+
+
+def clear_intern_pools():
+    """
+    Forget every canonical supernumber created by interned SuperNumbers sets.
+    """
+    _intern_pools.clear()
+
 
 class SuperNumber:
     """
@@ -9,6 +30,8 @@ class SuperNumber:
     with two other integers: a modulus (aka n), and a multiplier (aka alpha).
     """
 
+    __slots__ = ("object", "multiplier", "modulus")
+
     def __init__(self, obj, mod, mult):
         """
         Create a supernumber from the underlying integer, modulus, and
@@ -31,6 +54,18 @@ class SuperNumber:
         self.multiplier = mult % mod
         self.modulus = mod
 
+    @classmethod
+    def _trusted(cls, obj, mod, mult):
+        """
+        Create a supernumber without any of the checks in __init__. Only for
+        use when obj and mult are ints already reduced modulo mod.
+        """
+        sn = _new(cls)
+        sn.object = obj
+        sn.multiplier = mult
+        sn.modulus = mod
+        return sn
+
     def __repr__(self):
         """
         Formats and prints a readable supernumber.
@@ -46,20 +81,51 @@ class SuperNumber:
 
         (x + y + alpha*x*y) % n
         """
-        if self.multiplier == other.multiplier and self.modulus == other.modulus:
-            return SuperNumber(
-                (
-                    self.object
-                    + other.object
-                    + (self.multiplier * self.object * other.object)
-                )
-                % self.modulus,
-                self.modulus,
-                self.multiplier,
-            )
+        mult = self.multiplier
+        mod = self.modulus
+        if mult == other.multiplier and mod == other.modulus:
+            x = self.object
+            y = other.object
+            # The result is already reduced, so skip the checks in __init__.
+            result = _new(SuperNumber)
+            result.object = (x + y + mult * x * y) % mod
+            result.multiplier = mult
+            result.modulus = mod
+            return result
         else:
             raise Exception("Modulus and multiplier are not the same.")
 
+    def __pow__(self, k):
+        """
+        Returns the product of k copies of itself, in O(log k) time. The
+        zeroth power is the identity, 0.
+        """
+        if not type(k) is int:
+            raise TypeError("Exponent is not an int.")
+        if k < 0:
+            raise Exception("Exponent is not greater than zero.")
+        return SuperNumber._trusted(
+            SuperNumberPower(self.object, k, self.modulus, self.multiplier),
+            self.modulus,
+            self.multiplier,
+        )
+
+    def index_and_period(self):
+        """
+        Returns the index m and period r of this supernumber: the smallest
+        m, r ≥ 1 such that x^(m+r) = x^m.
+        """
+        return CyclicStructure(self.modulus, self.multiplier).index_and_period(
+            self.object
+        )
+
+    def order(self):
+        """
+        Returns the number of distinct powers of this supernumber. For a
+        supernumber with an inverse this is the smallest k ≥ 1 with x^k = 0.
+        """
+        return CyclicStructure(self.modulus, self.multiplier).order(self.object)
+
     def __eq__(self, other):
         """
         Checks equality between itself and another supernumber passed in as other.
@@ -82,10 +148,13 @@ class SuperNumbers:
     Create multiple SuperNumbers which are iterable.
     """
 
-    def __init__(self, mod, mult):
+    def __init__(self, mod, mult, interned=False, backend=None):
         """
         Create a representation of the set of supernumbers with the given
-        modulus and multiplier.
+        modulus and multiplier. If interned is true, iterating the set reuses
+        one canonical instance per value instead of creating new ones.
+        backend names the backend for arrays of this set's supernumbers to
+        multiply with; by default SelectBackend chooses.
         """
         if not type(mod) is int:
             raise TypeError("Modulus is not an int.")
@@ -97,6 +166,49 @@ class SuperNumbers:
             raise Exception("Multiplier is not greater than zero.")
         self.modulus = mod
         self.multiplier = mult % mod
+        self.interned = interned
+        self._backend = backend
+
+    @property
+    def backend(self):
+        """
+        The backend arrays of this set's supernumbers multiply with. Its name
+        can be passed back in to reproduce a result with the same arithmetic.
+        """
+        # Imported here, so supernumbers alone don't need NumPy.
+        from backend import GetBackend, SelectBackend
+
+        if self._backend is None:
+            return SelectBackend(self.modulus)
+        return GetBackend(self._backend)
+
+    def _make(self):
+        """
+        Return a function turning a value below the modulus into a member of
+        this set, taking it from the intern pool if the set is interned.
+        """
+        mod = self.modulus
+        mult = self.multiplier
+        trusted = SuperNumber._trusted
+        if not self.interned:
+            return lambda x: trusted(x, mod, mult)
+
+        key = (mod, mult)
+        pool = _intern_pools.get(key)
+        if pool is None:
+            pool = _intern_pools[key] = {}
+            if len(_intern_pools) > INTERN_POOL_COUNT:
+                _intern_pools.popitem(last=False)
+        else:
+            _intern_pools.move_to_end(key)
+
+        def make(x):
+            sn = pool.get(x)
+            if sn is None:
+                sn = pool[x] = trusted(x, mod, mult)
+            return sn
+
+        return make
 
     def __repr__(self):
         """
@@ -114,16 +226,63 @@ class SuperNumbers:
         """
         Creates n (modulus) amount of supernumbers
         """
+        return map(self._make(), range(self.modulus))
+
+    def __len__(self):
+        """
+        Returns the amount of supernumbers. Python limits len() to
+        sys.maxsize, so use size() for larger sets.
+        """
+        return self.modulus
+
+    def __bool__(self):
+        """
+        A set of supernumbers is only empty if its modulus is zero. This keeps
+        truth tests working for moduli too large for len().
+        """
+        return self.modulus > 0
+
+    def __contains__(self, sn):
+        """
+        Checks whether a supernumber belongs to this set, which it does if it
+        has the same modulus and multiplier.
+        """
         return (
-            SuperNumber(x, self.modulus, self.multiplier) for x in range(self.modulus)
+            isinstance(sn, SuperNumber)
+            and sn.modulus == self.modulus
+            and sn.multiplier == self.multiplier
         )
 
+    def __getitem__(self, key):
+        """
+        Returns the supernumber with the given value (counting back from the
+        end if it's negative), or a lazy SuperNumbersView for a slice.
+        """
+        return SuperNumbersView(self, range(self.modulus))[key]
+
     def __eq__(self, other):
         """
         Checks equality between itself and another supernumber passed in as other.
         """
         return self.modulus == other.modulus and self.multiplier == other.multiplier
 
+    def index_and_periods(self):
+        """
+        Returns the index and period (see SuperNumber.index_and_period) of
+        every supernumber in this set, in iteration order. This only has to
+        factorise n and alpha once, rather than once per supernumber.
+        """
+        structure = CyclicStructure(self.modulus, self.multiplier)
+        return [structure.index_and_period(x) for x in range(self.modulus)]
+
+    def orders(self):
+        """
+        Returns the order (see SuperNumber.order) of every supernumber in this
+        set, in iteration order.
+        """
+        structure = CyclicStructure(self.modulus, self.multiplier)
+        return [structure.order(x) for x in range(self.modulus)]
+
     def iter_below(self, sn):
         """
         Return an iterator of every supernumber in this set up until sn.
@@ -131,4 +290,70 @@ class SuperNumbers:
         if self.modulus != sn.modulus or self.multiplier != sn.multiplier:
             raise Exception(f"Supernumber {sn} is not compatible with {self}")
 
-        return (SuperNumber(x, self.modulus, self.multiplier) for x in range(sn.object))
+        return map(self._make(), range(sn.object))
+
+
+class SuperNumbersView:
+    """
+    A lazy, read-only view of some of the supernumbers in a SuperNumbers set,
+    given by a range of their values, as returned by slicing the set. Nothing
+    is created until it's accessed, and every access takes constant time.
+    """
+
+    def __init__(self, sns, values):
+        """
+        Create a view of the supernumbers in sns whose values are in the range
+        values.
+        """
+        self.sns = sns
+        self.values = values
+
+    def __repr__(self):
+        """
+        Formats and prints a readable view.
+        """
+        return (
+            f"<SuperNumbersView {self.values} mod {self.sns.modulus} "
+            f"| {self.sns.multiplier}>"
+        )
+
+    def size(self):
+        """
+        Returns the amount of supernumbers in the view.
+        """
+        values = self.values
+        return max(0, -(-(values.stop - values.start) // values.step))
+
+    def __len__(self):
+        """
+        Returns the amount of supernumbers in the view. Python limits len()
+        to sys.maxsize, so use size() for larger views.
+        """
+        return len(self.values)
+
+    def __bool__(self):
+        """
+        Checks whether the view has any supernumbers in it.
+        """
+        return self.size() > 0
+
+    def __iter__(self):
+        """
+        Iterate over the supernumbers in the view.
+        """
+        return map(self.sns._make(), self.values)
+
+    def __contains__(self, sn):
+        """
+        Checks whether a supernumber is in this view.
+        """
+        return sn in self.sns and sn.object in self.values
+
+    def __getitem__(self, key):
+        """
+        Returns the supernumber at the given position in the view, or a
+        narrower view for a slice.
+        """
+        if isinstance(key, slice):
+            return SuperNumbersView(self.sns, self.values[key])
+        return self.sns._make()(self.values[key])
@@ -0,0 +1,186 @@
+"""
+Provides versions of the property functions that answer for composite n by
+combining answers for the prime powers dividing it, so that a sweep only does
+the work for each prime power once.
+
+By the Chinese Remainder Theorem, x ↦ (x mod p^k for each p^k dividing n) is
+one-to-one, and since x + y + alpha*x*y mod p^k only depends on x, y and alpha
+mod p^k, multiplication mod n is multiplication mod each p^k side by side. So:
+
+- x * x = x for every x exactly when that holds mod every p^k
+- multiplication is commutative, or associative, exactly when it is mod
+  every p^k
+- the super roots of one mod n are the numbers whose residue mod each p^k is
+  a super root of one there, so their count is the product of the counts
+
+The results for each (p^k, alpha mod p^k) come from props_table by default,
+and are cached. Spans aren't included: the span of some generators mod n is
+only a subset of the product of their spans mod each p^k, so it can't be put
+back together from them.
+
+The functions have the same names as those in props, so a sweep can use them
+with props="crt".
+"""
+
+import importlib
+from collections import OrderedDict
+
+from congruence import CombineResidues
+from core import SuperNumber
+from primes import Factorize
+
+CRT_CACHE_SIZE = 4096
+
+
+class CRTEngine:
+    """
+    Answers the property functions for any n from the answers for the prime
+    powers dividing it, which are computed with the property functions in
+    the props module, and the most recently used of which are cached.
+    """
+
+    def __init__(self, props="props_table", cache_size=CRT_CACHE_SIZE):
+        """
+        Create an engine with an empty cache.
+        """
+        self.props = props
+        self.cache_size = cache_size
+        self.hits = 0
+        self.misses = 0
+        self._results = OrderedDict()
+
+    def __repr__(self):
+        """
+        Formats and prints a readable engine, with its counters.
+        """
+        return (
+            f"<CRTEngine {self.props} | {len(self._results)} cached, "
+            f"{self.hits} hits, {self.misses} misses>"
+        )
+
+    def clear(self):
+        """
+        Forget every cached prime-power result.
+        """
+        self._results.clear()
+
+    def _primePowerResult(self, name, q, alpha):
+        """
+        Return the result of the named property for the prime power q and
+        alpha, with lists of supernumbers as lists of their values.
+        """
+        key = (name, q, alpha % q)
+        if key in self._results:
+            self._results.move_to_end(key)
+            self.hits += 1
+            return self._results[key]
+
+        self.misses += 1
+        result = getattr(importlib.import_module(self.props), name)(q, alpha % q)
+        if isinstance(result, list):
+            result = [sn.object for sn in result]
+        self._results[key] = result
+        if len(self._results) > self.cache_size:
+            self._results.popitem(last=False)
+        return result
+
+    def _holdsForEveryFactor(self, name, n, alpha):
+        """
+        Check a property that holds mod n exactly when it holds mod every
+        prime power dividing n.
+        """
+        return all(
+            self._primePowerResult(name, p ** k, alpha)
+            for p, k in Factorize(n).items()
+        )
+
+    def HasSuperNumberIdempotentProperty(self, n, alpha):
+        """
+        Checks for given n and alpha whether the equality x * x = x holds for
+        all supernumbers
+        """
+        return self._holdsForEveryFactor("HasSuperNumberIdempotentProperty", n, alpha)
+
+    def IsCommutativeSuperNumberMultiplication(self, n, alpha):
+        """
+        Checks for given n and alpha whether the equality x * y = y * x holds
+        for all supernumbers
+        """
+        return self._holdsForEveryFactor(
+            "IsCommutativeSuperNumberMultiplication", n, alpha
+        )
+
+    def IsAssociativeSuperNumberMultiplication(self, n, alpha):
+        """
+        Checks for given n and alpha whether the equality
+        (x * y) * z = x * (y * z) holds for all supernumbers
+        """
+        return self._holdsForEveryFactor(
+            "IsAssociativeSuperNumberMultiplication", n, alpha
+        )
+
+    def SuperRootsOfOne(self, n, alpha):
+        """
+        Calculates for given n and alpha the list of all elements that
+        satisfy x * x = 1, combining the roots mod each prime power.
+        """
+        factors = Factorize(n)
+        moduli = [p ** k for p, k in factors.items()]
+        residues = [
+            self._primePowerResult("SuperRootsOfOne", q, alpha) for q in moduli
+        ]
+        combined = CombineResidues(residues, moduli)
+        return [SuperNumber(x, n, alpha) for x in sorted(combined)]
+
+    def CountSuperRootsOfOne(self, n, alpha):
+        """
+        Returns the number of super roots of one for given n and alpha, the
+        product of the numbers mod each prime power, without listing them.
+        """
+        count = 1
+        for p, k in Factorize(n).items():
+            count *= len(self._primePowerResult("SuperRootsOfOne", p ** k, alpha))
+        return count
+
+
+# The engine used by the module-level functions.
+_engine = CRTEngine()
+
+
+def GetCRTEngine():
+    """
+    Return the engine used by the module-level functions.
+    """
+    return _engine
+
+
+def HasSuperNumberIdempotentProperty(n, alpha):
+    """
+    Checks for given n and alpha whether the equality x * x = x holds for all
+    supernumbers, using the module's engine.
+    """
+    return _engine.HasSuperNumberIdempotentProperty(n, alpha)
+
+
+def IsCommutativeSuperNumberMultiplication(n, alpha):
+    """
+    Checks for given n and alpha whether the equality x * y = y * x holds for
+    all supernumbers, using the module's engine.
+    """
+    return _engine.IsCommutativeSuperNumberMultiplication(n, alpha)
+
+
+def IsAssociativeSuperNumberMultiplication(n, alpha):
+    """
+    Checks for given n and alpha whether the equality (x * y) * z = x * (y * z)
+    holds for all supernumbers, using the module's engine.
+    """
+    return _engine.IsAssociativeSuperNumberMultiplication(n, alpha)
+
+
+def SuperRootsOfOne(n, alpha):
+    """
+    Calculates for given n and alpha the list of all elements that satisfy
+    x * x = 1, using the module's engine.
+    """
+    return _engine.SuperRootsOfOne(n, alpha)
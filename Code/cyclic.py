@@ -0,0 +1,112 @@
+"""
+Provides fast powers and the cyclic structure (index and period) of
+supernumbers.
+
+For alpha > 0, x ↦ 1 + alpha*x maps the supernumbers mod n one-to-one into
+the integers mod alpha*n, turning supernumber multiplication into ordinary
+multiplication: (1 + alpha*x)(1 + alpha*y) = 1 + alpha*(x + y + alpha*x*y).
+So x^k corresponds to (1 + alpha*x)^k, and questions about powers become
+questions about the multiplicative monoid mod alpha*n, which can be answered
+one prime power at a time.
+"""
+
+from math import gcd
+
+from primes import Factorize
+
+
+def _lcm(a, b):
+    """
+    Return the least common multiple of a and b.
+    """
+    return a * b // gcd(a, b)
+
+
+def SuperNumberPower(x, k, n, alpha):
+    """
+    Return the value of x^k, the product of k copies of the supernumber with
+    value x, for given n and alpha. x^0 is the identity, 0.
+    """
+
+    alpha %= n
+    if alpha == 0:
+        return k * x % n
+    # (1 + alpha*x)^k ≡ 1 (mod alpha), so the division is exact.
+    return (pow(1 + alpha * x, k, alpha * n) - 1) // alpha % n
+
+
+class CyclicStructure:
+    """
+    Answers questions about the powers of every supernumber for a given n and
+    alpha. The factorisations this needs are worked out once, up front, so
+    each supernumber only costs a few modular exponentiations.
+    """
+
+    def __init__(self, mod, mult):
+        """
+        Factorise alpha*n, and the order of the group of units modulo each of
+        its prime powers.
+        """
+        self.modulus = mod
+        self.multiplier = mult % mod
+        self._prime_powers = []
+        if self.multiplier == 0:
+            return
+
+        factors = Factorize(mod)
+        for p, e in Factorize(self.multiplier).items():
+            factors[p] = factors.get(p, 0) + e
+        for p, e in sorted(factors.items()):
+            units = Factorize(p - 1) if p > 2 else {}
+            if e > 1:
+                units[p] = units.get(p, 0) + e - 1
+            self._prime_powers.append((p, e, p ** e, p ** (e - 1) * (p - 1), units))
+
+    def _unitOrder(self, u, prime_power, group_order, group_factors):
+        """
+        Return the multiplicative order of a unit u modulo a prime power, by
+        dividing the order of the group of units by each of its prime factors
+        for as long as u^order stays 1.
+        """
+        order = group_order
+        for q, k in group_factors.items():
+            for _ in range(k):
+                if pow(u, order // q, prime_power) == 1:
+                    order //= q
+                else:
+                    break
+        return order
+
+    def index_and_period(self, x):
+        """
+        Return the index m and period r of the supernumber with value x: the
+        smallest m, r ≥ 1 with x^(m+r) = x^m.
+        """
+        if self.multiplier == 0:
+            # x^k = k*x, which first repeats after n / gcd(x, n) steps.
+            return 1, self.modulus // gcd(x, self.modulus)
+
+        u = 1 + self.multiplier * x
+        index, period = 1, 1
+        for p, e, prime_power, group_order, group_factors in self._prime_powers:
+            if u % p == 0:
+                # u^k ≡ 0 (mod p^e) from the first k with k*v ≥ e, where p^v
+                # is the largest power of p dividing u, and never before.
+                v = 1
+                while v < e and u % p ** (v + 1) == 0:
+                    v += 1
+                index = max(index, -(-e // v))
+            else:
+                order = self._unitOrder(
+                    u % prime_power, prime_power, group_order, group_factors
+                )
+                period = _lcm(period, order)
+        return index, period
+
+    def order(self, x):
+        """
+        Return the order of the supernumber with value x: the number of
+        distinct powers it has, which is its index plus its period minus one.
+        """
+        index, period = self.index_and_period(x)
+        return index + period - 1
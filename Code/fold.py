@@ -0,0 +1,186 @@
+"""
+Provides functions to multiply together, or more generally fold, a stream of
+supernumbers of any length in constant memory:
+
+>>> SuperNumberProduct(SuperNumber(x % 7, 7, 3) for x in range(10**6))
+<2 mod 7 | 3>
+
+The stream is read a chunk at a time, and each chunk is reduced as an array,
+halving it with one vectorized operation per step. Since multiplication is
+commutative and associative, chunks can be reduced in any order, so they can
+also be handed out to worker processes. SuperNumberFold does the same for any
+operation that is commutative and associative too.
+
+When gcd(alpha, n) = 1 there is an absorbing element z = -1/alpha (mod n),
+with z * x = z for every x: 1 + alpha*z ≡ 0, so z + x + alpha*z*x ≡ z. Once
+the running product reaches it nothing more can change it, so no more chunks
+are read.
+"""
+
+import itertools
+import multiprocessing
+from collections import deque
+
+import numpy as np
+
+from backend import SelectBackend
+from core import SuperNumber
+from table import MultiplyValues
+
+DEFAULT_CHUNKSIZE = 2 ** 16
+
+
+def AbsorbingElement(n, alpha):
+    """
+    Returns the value of the supernumber z with z * x = z for every x, for
+    given n and alpha, or None if there isn't one.
+    """
+    alpha %= n
+    try:
+        return -pow(alpha, -1, n) % n
+    except ValueError:
+        # alpha has no inverse mod n
+        return None
+
+
+def _reduce(operation, values, mod, mult):
+    """
+    Return a non-empty list of supernumber values combined with operation,
+    combining the first half of the array with the second half until one
+    value is left.
+    """
+    values = SelectBackend(mod).asarray(values)
+    while len(values) > 1:
+        half = len(values) // 2
+        odd = values[2 * half :]
+        values = np.concatenate(
+            (operation(values[:half], values[half : 2 * half], mod, mult), odd)
+        )
+    return int(values[0])
+
+
+def _reduceChunk(task):
+    """
+    Reduce one chunk in a worker.
+    """
+    return _reduce(*task)
+
+
+def _chunks(iterable, first, chunksize):
+    """
+    Yield the values of the supernumbers in iterable, chunksize at a time,
+    making sure they all have the same modulus and multiplier as first.
+    """
+    mod, mult = first.modulus, first.multiplier
+    iterator = iter(iterable)
+    while True:
+        chunk = list(itertools.islice(iterator, chunksize))
+        if not chunk:
+            return
+        values = []
+        for sn in chunk:
+            if sn.modulus != mod or sn.multiplier != mult:
+                raise Exception("Modulus and multiplier are not the same.")
+            values.append(sn.object)
+        yield values
+
+
+def _start(iterator, start, caller):
+    """
+    Return start, or if it's None the first supernumber from iterator, since
+    without either there's no way to know n and alpha.
+    """
+    if start is None:
+        start = next(iterator, None)
+        if start is None:
+            raise ValueError(f"{caller} called on empty iterable")
+    return start
+
+
+def _fold(operation, iterator, start, absorbing, processes, chunksize):
+    """
+    Combine start and every supernumber from iterator with operation, a chunk
+    at a time, stopping early if the result reaches absorbing.
+    """
+    mod, mult = start.modulus, start.multiplier
+    chunks = _chunks(iterator, start, chunksize)
+
+    result = start.object
+    if result == absorbing:
+        return start
+
+    def combine(value):
+        """
+        Combine the result so far with a reduced chunk, returning whether it
+        has become absorbing.
+        """
+        nonlocal result
+        result = int(operation(result, value, mod, mult))
+        return result == absorbing
+
+    if processes == 1:
+        for values in chunks:
+            if combine(_reduce(operation, values, mod, mult)):
+                break
+        return SuperNumber._trusted(result, mod, mult)
+
+    with multiprocessing.Pool(processes) as pool:
+        limit = 2 * (processes or multiprocessing.cpu_count())
+        pending = deque()
+        for values in chunks:
+            task = (operation, values, mod, mult)
+            pending.append(pool.apply_async(_reduceChunk, (task,)))
+            if len(pending) >= limit and combine(pending.popleft().get()):
+                break
+        else:
+            while pending and not combine(pending.popleft().get()):
+                pass
+    return SuperNumber._trusted(result, mod, mult)
+
+
+def SuperNumberFold(
+    operation,
+    iterable,
+    start=None,
+    absorbing=None,
+    processes=1,
+    chunksize=DEFAULT_CHUNKSIZE,
+):
+    """
+    Combine every supernumber in iterable with operation, reading it lazily,
+    a chunk at a time. operation takes two arrays (or an array and an int)
+    of values, the modulus and the multiplier, and returns them combined
+    elementwise, as table.MultiplyValues does. It must be commutative and
+    associative, since chunks are reduced in halves and combined in any
+    order, and if processes isn't 1 it must be a module-level function, so
+    that it can be sent to the workers.
+
+    The result is combined with start, if given, which also gives n and
+    alpha when iterable is empty; with neither it's an error. If absorbing
+    is given, it's a value that operation never changes, so once the result
+    reaches it no more chunks are read. processes works as it does for
+    SuperNumberProduct.
+    """
+
+    iterator = iter(iterable)
+    start = _start(iterator, start, "SuperNumberFold")
+    return _fold(operation, iterator, start, absorbing, processes, chunksize)
+
+
+def SuperNumberProduct(iterable, start=None, processes=1, chunksize=DEFAULT_CHUNKSIZE):
+    """
+    Multiply together every supernumber in iterable, reading it lazily, a
+    chunk at a time, and stopping early if the product becomes absorbing.
+    The product is multiplied by start, if given, which also gives n and
+    alpha when iterable is empty; with neither, there's no way to know the
+    identity to return, so it's an error.
+
+    By default everything runs in this process. Otherwise chunks are reduced
+    across a pool of processes (as many as there are CPUs, if processes is
+    None), with only a couple of chunks per process in flight at once.
+    """
+
+    iterator = iter(iterable)
+    start = _start(iterator, start, "SuperNumberProduct")
+    absorbing = AbsorbingElement(start.modulus, start.multiplier)
+    return _fold(MultiplyValues, iterator, start, absorbing, processes, chunksize)
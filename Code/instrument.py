@@ -0,0 +1,189 @@
+"""
+Provides opt-in instrumentation, to find out where the time goes in a run:
+
+>>> with Instrumentation() as instrumentation:
+...     sn.IsAssociativeSuperNumberMultiplication(10, 3)
+>>> instrumentation.report()
+
+While it's active, it counts supernumber multiplications, supernumbers
+created and rounds of span calculations, and times every call to a property
+function. It works by swapping in counting versions of the functions involved
+when it starts and putting the originals back when it stops, so it costs
+nothing when it isn't active.
+"""
+
+import json
+import os
+import sys
+import time
+
+from core import SuperNumber
+from span import SuperNumberSpan
+from sweep import PROPERTIES
+
+PROPERTY_NAMES = tuple(PROPERTIES)
+
+_DIRECTORY = os.path.dirname(os.path.abspath(__file__))
+
+# The instrumentation currently active, if any.
+_active = None
+
+
+def _libraryModules():
+    """
+    Return every module of this library that has been imported.
+    """
+    return [
+        module
+        for module in list(sys.modules.values())
+        if os.path.dirname(os.path.abspath(getattr(module, "__file__", None) or ""))
+        == _DIRECTORY
+    ]
+
+
+class Instrumentation:
+    """
+    A context manager that counts operations and times property calls while
+    it's active. Only one can be active at a time.
+    """
+
+    def __init__(self):
+        """
+        Create an instrumentation with every count at zero.
+        """
+        self.multiplications = 0
+        self.instances = 0
+        self.span_rounds = 0
+        # "module.property" -> [calls, seconds]
+        self.properties = {}
+        # (n, alpha) -> seconds, counting only calls not made by other
+        # property functions
+        self.cells = {}
+        self._depth = 0
+        self._restore = []
+
+    def __repr__(self):
+        """
+        Formats and prints a readable summary of the counts.
+        """
+        return (
+            f"<Instrumentation {self.multiplications} multiplications, "
+            f"{self.instances} instances, {self.span_rounds} span rounds>"
+        )
+
+    def _patch(self, owner, name, replacement):
+        """
+        Replace owner.name with replacement, remembering how to undo it.
+        """
+        self._restore.append((owner, name, owner.__dict__[name]))
+        setattr(owner, name, replacement)
+
+    def __enter__(self):
+        """
+        Start counting, by swapping in counting versions of functions.
+        """
+        global _active
+        if _active is not None:
+            raise Exception("Instrumentation is already active.")
+        _active = self
+
+        mul = SuperNumber.__mul__
+        init = SuperNumber.__init__
+        trusted = SuperNumber._trusted.__func__
+        round_ = SuperNumberSpan._round
+
+        def countingMul(sn, other):
+            self.multiplications += 1
+            self.instances += 1
+            return mul(sn, other)
+
+        def countingInit(sn, *args):
+            self.instances += 1
+            init(sn, *args)
+
+        def countingTrusted(cls, *args):
+            self.instances += 1
+            return trusted(cls, *args)
+
+        def countingRound(span, frontier):
+            self.span_rounds += 1
+            return round_(span, frontier)
+
+        self._patch(SuperNumber, "__mul__", countingMul)
+        self._patch(SuperNumber, "__init__", countingInit)
+        self._patch(SuperNumber, "_trusted", classmethod(countingTrusted))
+        self._patch(SuperNumberSpan, "_round", countingRound)
+
+        # Wrap each property function everywhere it can be looked up from,
+        # which includes modules that imported it by name.
+        modules = _libraryModules()
+        wrappers = {}
+        for module in modules:
+            for name in PROPERTY_NAMES:
+                fn = module.__dict__.get(name)
+                if callable(fn) and id(fn) not in wrappers:
+                    wrappers[id(fn)] = self._timed(fn, f"{fn.__module__}.{name}")
+        for module in modules:
+            for name in PROPERTY_NAMES:
+                fn = module.__dict__.get(name)
+                if id(fn) in wrappers:
+                    self._patch(module, name, wrappers[id(fn)])
+
+        return self
+
+    def __exit__(self, *exc):
+        """
+        Stop counting, putting back the original functions.
+        """
+        global _active
+        for owner, name, original in reversed(self._restore):
+            setattr(owner, name, original)
+        self._restore = []
+        _active = None
+        return False
+
+    def _timed(self, fn, label):
+        """
+        Return a version of the property function fn that records its wall
+        time under label, and under its (n, alpha).
+        """
+
+        def timed(n, alpha, *args, **kwargs):
+            self._depth += 1
+            start = time.perf_counter()
+            try:
+                return fn(n, alpha, *args, **kwargs)
+            finally:
+                elapsed = time.perf_counter() - start
+                self._depth -= 1
+                stats = self.properties.setdefault(label, [0, 0.0])
+                stats[0] += 1
+                stats[1] += elapsed
+                if self._depth == 0:
+                    self.cells[(n, alpha)] = self.cells.get((n, alpha), 0.0) + elapsed
+
+        return timed
+
+    def report(self):
+        """
+        Returns everything recorded, as a dict that can be saved as JSON.
+        """
+        return {
+            "multiplications": self.multiplications,
+            "instances": self.instances,
+            "span_rounds": self.span_rounds,
+            "properties": {
+                label: {"calls": calls, "seconds": seconds}
+                for label, (calls, seconds) in sorted(self.properties.items())
+            },
+            "cells": [
+                {"n": n, "alpha": alpha, "seconds": seconds}
+                for (n, alpha), seconds in sorted(self.cells.items())
+            ],
+        }
+
+    def write_json(self, stream):
+        """
+        Write the report to stream as JSON.
+        """
+        json.dump(self.report(), stream, indent=2)
@@ -0,0 +1,116 @@
+"""
+Provides a function to enumerate every subsemigroup for a given n and alpha,
+that is, every distinct set SuperNumberSetSpan can produce.
+"""
+
+from collections import deque
+
+from core import SuperNumber
+from span import SuperNumberSpan
+
+
+class Subsemigroup:
+    """
+    One subsemigroup for a given n and alpha: its elements (as a bitmask with
+    bit x set for each value x in it), a minimal set of generators, and the
+    bitmasks of the subsemigroups directly above it in the lattice.
+    """
+
+    def __init__(self, mod, mult, bitmask, generators, covers):
+        """
+        Create a record of a subsemigroup.
+        """
+        self.modulus = mod
+        self.multiplier = mult
+        self.bitmask = bitmask
+        self.generators = generators
+        self.covers = covers
+
+    def __repr__(self):
+        """
+        Formats and prints a readable subsemigroup.
+        """
+        return (
+            f"<Subsemigroup {self.elements()} generated by {self.generators} "
+            f"mod {self.modulus} | {self.multiplier}>"
+        )
+
+    def elements(self):
+        """
+        Returns the values in the subsemigroup, in increasing order.
+        """
+        return [x for x in range(self.modulus) if self.bitmask >> x & 1]
+
+    def as_set(self):
+        """
+        Returns the subsemigroup as a set of supernumbers.
+        """
+        return {SuperNumber(x, self.modulus, self.multiplier) for x in self.elements()}
+
+
+def _minimalGenerators(span):
+    """
+    Drop generators from a span, one at a time, for as long as the rest still
+    generate the same span, and return those that are left. No generator in
+    the result can be removed, though a smaller generating set may exist.
+    """
+
+    generators = list(span.generators)
+    bitmask = span.as_bitmask()
+    for gen in list(generators):
+        rest = [x for x in generators if x != gen]
+        if rest:
+            smaller = SuperNumberSpan(
+                [SuperNumber._trusted(x, span.modulus, span.multiplier) for x in rest]
+            )
+            if smaller.as_bitmask() == bitmask:
+                generators = rest
+    return generators
+
+
+def Subsemigroups(n, alpha):
+    """
+    Yield every subsemigroup for the given n and alpha exactly once, as a
+    Subsemigroup, working outwards from the smallest ones.
+
+    Every subsemigroup contains an idempotent, so the search starts from the
+    one-element subsemigroups {e}, and extends each subsemigroup it finds by
+    one element at a time, recognising ones it has seen before by their
+    bitmask. The covers of a subsemigroup (those directly above it) are the
+    smallest of these one-element extensions.
+    """
+
+    sns = [SuperNumber._trusted(x, n, alpha % n) for x in range(n)]
+    seen = set()
+    queue = deque()
+    for x in sns:
+        if x * x == x:
+            idempotent = SuperNumberSpan([x])
+            seen.add(idempotent.as_bitmask())
+            queue.append(idempotent)
+
+    while queue:
+        span = queue.popleft()
+        span.generators = _minimalGenerators(span)
+        bitmask = span.as_bitmask()
+
+        extensions = {}
+        for x in sns:
+            if x.object not in span:
+                extension = span.copy()
+                extension.extend([x])
+                extensions.setdefault(extension.as_bitmask(), extension)
+
+        covers = [
+            mask
+            for mask in extensions
+            if not any(other != mask and other & mask == other for other in extensions)
+        ]
+        for mask, extension in extensions.items():
+            if mask not in seen:
+                seen.add(mask)
+                queue.append(extension)
+
+        yield Subsemigroup(
+            n, alpha % n, bitmask, sorted(span.generators), sorted(covers)
+        )
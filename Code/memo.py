@@ -0,0 +1,199 @@
+"""
+Remembers the results of the property functions, which only depend on n and
+alpha, so asking the same question twice is instant. The most recently used
+results are kept in memory and, if a path is given, every result is also saved
+in an SQLite database there, so it's shared between processes and sessions:
+
+>>> sn.SetMemoCache(path="verdicts.sqlite")
+
+Results are remembered under the function's name, n, alpha and the library
+version, so a new version never reuses an old version's answers.
+"""
+
+import functools
+import json
+import os
+import sqlite3
+import threading
+from collections import OrderedDict
+
+from core import SuperNumber
+from version import __version__
+
+MEMO_CACHE_SIZE = 1024
+
+# What get returns when a result isn't remembered.
+MISSING = object()
+
+
+def _encode(result):
+    """
+    Return a result as something that can be saved as JSON. Lists of
+    supernumbers become lists of ints.
+    """
+    if isinstance(result, list):
+        return [sn.object for sn in result]
+    return result
+
+
+def _decode(value, n, alpha):
+    """
+    Undo _encode for a result for n and alpha.
+    """
+    if isinstance(value, list):
+        return [SuperNumber(x, n, alpha) for x in value]
+    return value
+
+
+class MemoCache:
+    """
+    A cache of results from the property functions, holding up to maxsize
+    of them in memory (none at all if maxsize is 0), and all of them in an
+    SQLite database at path, if it's given.
+    """
+
+    def __init__(self, maxsize=MEMO_CACHE_SIZE, path=None, version=__version__):
+        """
+        Create a cache, with nothing in memory yet.
+        """
+        self.maxsize = maxsize
+        self.path = path
+        self.version = version
+        self.hits = 0
+        self.misses = 0
+        self._results = OrderedDict()
+        self._local = threading.local()
+
+    def __repr__(self):
+        """
+        Formats and prints a readable cache, with its counters.
+        """
+        where = "" if self.path is None else f" and {self.path}"
+        return (
+            f"<MemoCache {len(self._results)}/{self.maxsize} in memory{where} | "
+            f"{self.hits} hits, {self.misses} misses>"
+        )
+
+    def _database(self):
+        """
+        Returns a connection to the database, creating its table if needed.
+        Each thread, and each process forked from this one, gets its own
+        connection, since SQLite connections can't be shared across threads
+        or a fork.
+        """
+        local = self._local
+        if getattr(local, "pid", None) != os.getpid():
+            local.connection = sqlite3.connect(self.path, timeout=30)
+            local.connection.execute(
+                "CREATE TABLE IF NOT EXISTS results ("
+                "function TEXT, n TEXT, alpha TEXT, version TEXT, result TEXT, "
+                "PRIMARY KEY (function, n, alpha, version))"
+            )
+            local.connection.commit()
+            local.pid = os.getpid()
+        return local.connection
+
+    def get(self, name, n, alpha):
+        """
+        Returns the remembered result of the named function for n and alpha,
+        or MISSING if there isn't one.
+        """
+        key = (name, n, alpha)
+        if key in self._results:
+            self._results.move_to_end(key)
+            self.hits += 1
+            return _decode(self._results[key], n, alpha)
+
+        if self.path is not None:
+            row = (
+                self._database()
+                .execute(
+                    "SELECT result FROM results "
+                    "WHERE function = ? AND n = ? AND alpha = ? AND version = ?",
+                    (name, str(n), str(alpha), self.version),
+                )
+                .fetchone()
+            )
+            if row is not None:
+                self.hits += 1
+                value = json.loads(row[0])
+                self._remember(key, value)
+                return _decode(value, n, alpha)
+
+        self.misses += 1
+        return MISSING
+
+    def _remember(self, key, value):
+        """
+        Keep an encoded result in memory, evicting the least recently used
+        one if there are too many.
+        """
+        if self.maxsize > 0:
+            self._results[key] = value
+            if len(self._results) > self.maxsize:
+                self._results.popitem(last=False)
+
+    def put(self, name, n, alpha, result):
+        """
+        Remember the result of the named function for n and alpha.
+        """
+        value = _encode(result)
+        self._remember((name, n, alpha), value)
+        if self.path is not None:
+            connection = self._database()
+            connection.execute(
+                "INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?)",
+                (name, str(n), str(alpha), self.version, json.dumps(value)),
+            )
+            connection.commit()
+
+    def clear(self):
+        """
+        Forget everything kept in memory. Results saved in the database are
+        kept.
+        """
+        self._results.clear()
+
+
+# The cache used by memoized functions.
+_cache = MemoCache()
+
+
+def GetMemoCache():
+    """
+    Return the cache currently used by memoized functions.
+    """
+    return _cache
+
+
+def SetMemoCache(maxsize=MEMO_CACHE_SIZE, path=None):
+    """
+    Replace the cache used by memoized functions with a new one, holding up
+    to maxsize results in memory and saving them at path if it's given, and
+    return it. SetMemoCache(0) turns memoization off.
+    """
+    global _cache
+    _cache = MemoCache(maxsize, path)
+    return _cache
+
+
+def Memoized(fn):
+    """
+    Return a version of the property function fn, taking n and alpha, that
+    remembers its results in the current cache. Results are cached under
+    alpha mod n, since that's all they depend on. The original function is
+    available as __wrapped__.
+    """
+    name = fn.__name__
+
+    @functools.wraps(fn)
+    def memoized(n, alpha):
+        cache = _cache
+        key = alpha % n
+        result = cache.get(name, n, key)
+        if result is MISSING:
+            result = fn(n, alpha)
+            cache.put(name, n, key, result)
+        return result
+
+    return memoized
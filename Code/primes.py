@@ -0,0 +1,98 @@
+"""
+Provides functions to test integers for primality and to factorise them.
+"""
+
+from math import gcd
+
+_SMALL_PRIMES = [2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37, 41]
+
+
+def IsPrime(n):
+    """
+    Checks whether n is prime, using the Miller-Rabin test with the first 13
+    primes as bases, which makes the answer exact for n below 3.3·10²⁴.
+    """
+
+    if n < 2:
+        return False
+    for p in _SMALL_PRIMES:
+        if n % p == 0:
+            return n == p
+
+    d, s = n - 1, 0
+    while d % 2 == 0:
+        d //= 2
+        s += 1
+
+    for base in _SMALL_PRIMES:
+        x = pow(base, d, n)
+        if x == 1 or x == n - 1:
+            continue
+        for _ in range(s - 1):
+            x = x * x % n
+            if x == n - 1:
+                break
+        else:
+            return False
+    return True
+
+
+def _findFactor(n):
+    """
+    Return a non-trivial factor of an odd composite n, using Pollard's rho
+    method with Brent's cycle detection.
+    """
+
+    for c in range(1, n):
+        y, r, q, g = 2, 1, 1, 1
+        while g == 1:
+            x = y
+            for _ in range(r):
+                y = (y * y + c) % n
+            k = 0
+            while k < r and g == 1:
+                ys = y
+                for _ in range(min(128, r - k)):
+                    y = (y * y + c) % n
+                    q = q * abs(x - y) % n
+                g = gcd(q, n)
+                k += 128
+            r *= 2
+        if g == n:
+            # The batch overshot; go back and step one at a time.
+            g = 1
+            while g == 1:
+                ys = (ys * ys + c) % n
+                g = gcd(abs(x - ys), n)
+        if g != n:
+            return g
+    raise ValueError(f"Couldn't find a factor of {n}")
+
+
+def Factorize(n):
+    """
+    Return the prime factorisation of a positive integer n as a dict of prime
+    -> exponent, with the primes in increasing order.
+    """
+
+    if not type(n) is int:
+        raise TypeError("Num is not an int.")
+    if n <= 0:
+        raise Exception("Num is not greater than zero.")
+
+    factors = {}
+    for p in _SMALL_PRIMES:
+        while n % p == 0:
+            factors[p] = factors.get(p, 0) + 1
+            n //= p
+
+    remaining = [n] if n > 1 else []
+    while remaining:
+        m = remaining.pop()
+        if IsPrime(m):
+            factors[m] = factors.get(m, 0) + 1
+        else:
+            d = _findFactor(m)
+            remaining += [d, m // d]
+
+    return dict(sorted(factors.items()))
@@ -1,30 +1,127 @@
 """
 Versions of the property functions that compute the answer both ways, and make
-sure they're equal, before returning them.
+sure they're equal, before returning them. Which calls are checked this way is
+decided by the current VerificationPolicy. Their results are remembered by
+memo, so only the first call for each n and alpha is computed (and checked).
 """
 
+import random
+
 import props as props_std
 import props_supernumbers as props_sns
+from memo import Memoized
+
+
+class VerificationPolicy:
+    """
+    Decides which calls to the checked functions compute the answer both ways,
+    and counts how many did and how many of those disagreed. The mode is one
+    of:
+
+    - ALWAYS: check every call
+    - NEVER: only use props
+    - SAMPLED: check a random fraction of calls
+    - BELOW_SIZE: check calls where n is below threshold
+    """
+
+    ALWAYS = "always"
+    NEVER = "never"
+    SAMPLED = "sampled"
+    BELOW_SIZE = "below_size"
+
+    def __init__(self, mode=ALWAYS, fraction=0.1, threshold=50, seed=None):
+        """
+        Create a policy. fraction is only used in SAMPLED mode, threshold
+        only in BELOW_SIZE mode, and seed seeds the sampling.
+        """
+        if mode not in (self.ALWAYS, self.NEVER, self.SAMPLED, self.BELOW_SIZE):
+            raise ValueError(f"Unknown verification mode {mode}")
+        if not 0 <= fraction <= 1:
+            raise ValueError("Fraction is not between zero and one.")
+        self.mode = mode
+        self.fraction = fraction
+        self.threshold = threshold
+        self._random = random.Random(seed)
+        self.reset_counters()
+
+    def __repr__(self):
+        """
+        Formats and prints a readable policy, with its counters.
+        """
+        return (
+            f"<VerificationPolicy {self.mode} | {self.checks}/{self.calls} "
+            f"checked, {self.disagreements} disagreed>"
+        )
+
+    def reset_counters(self):
+        """
+        Set the numbers of calls, checks and disagreements back to zero.
+        """
+        self.calls = 0
+        self.checks = 0
+        self.disagreements = 0
+
+    def should_check(self, n):
+        """
+        Decide whether a call for the given n should compute the answer both
+        ways.
+        """
+        if self.mode == self.ALWAYS:
+            return True
+        if self.mode == self.SAMPLED:
+            return self._random.random() < self.fraction
+        if self.mode == self.BELOW_SIZE:
+            return n < self.threshold
+        return False
+
+
+# The policy used by the checked functions.
+_policy = VerificationPolicy()
+
+
+def GetVerificationPolicy():
+    """
+    Return the policy currently used by the checked functions.
+    """
+    return _policy
+
+
+def SetVerificationPolicy(mode, **kwargs):
+    """
+    Replace the policy used by the checked functions with a new one, created
+    from the given mode and VerificationPolicy arguments, and return it.
+    """
+    global _policy
+    _policy = VerificationPolicy(mode, **kwargs)
+    return _policy
 
 
 def _makeCheckedFunction(name):
     """
     Given the name of a function in props and props_supernumbers, return a
-    version of that function that calls both functions, asserts the result is
-    equal and returns it.
+    version of that function that calls the props version and, if the current
+    policy says so, also the props_supernumbers version, asserting the results
+    are equal. The result is memoized.
     """
 
     def fn(n, alpha):
         """
-        Given n and alpha, call both versions of the function, check the
-        result, and return it.
+        Given n and alpha, call one or both versions of the function, check
+        the result if both were called, and return it.
         """
+        policy = _policy
+        policy.calls += 1
         std = getattr(props_std, name)(n, alpha)
-        sns = getattr(props_sns, name)(n, alpha)
-        assert std == sns
+        if policy.should_check(n):
+            policy.checks += 1
+            sns = getattr(props_sns, name)(n, alpha)
+            if std != sns:
+                policy.disagreements += 1
+            assert std == sns
         return std
 
-    return fn
+    fn.__name__ = fn.__qualname__ = name
+    return Memoized(fn)
 
 
 HasSuperNumberIdempotentProperty = _makeCheckedFunction(
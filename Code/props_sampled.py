@@ -0,0 +1,194 @@
+"""
+Versions of the property functions that test randomly drawn supernumbers
+rather than all of them, for n too large even for props_table. Each draws
+batches of random (x), (x, y) or (x, y, z) with NumPy, multiplies them a
+whole batch at a time, and stops at the first counterexample.
+
+Instead of a bool they return a SampledVerdict, which is false if a
+counterexample was found. Otherwise it's true, and gives an upper bound on
+the fraction of tuples that could break the property without any having been
+drawn: after N tuples with no counterexample, the fraction is below
+1 - (1 - confidence)^(1/N) with the given confidence, which is about
+4.6/N at 99%.
+"""
+
+import math
+
+import numpy as np
+
+from backend import INT64_LIMIT, SelectBackend
+
+DEFAULT_SAMPLES = 10 ** 6
+DEFAULT_BATCH = 10 ** 6
+
+
+class SampledVerdict:
+    """
+    The outcome of testing a property on random supernumbers.
+    """
+
+    def __init__(self, name, n, alpha, samples, confidence, counterexample=None):
+        """
+        Create a verdict for samples tuples, with the values of the first
+        counterexample found, if there was one.
+        """
+        self.property = name
+        self.n = n
+        self.alpha = alpha
+        self.samples = samples
+        self.confidence = confidence
+        self.counterexample = counterexample
+
+    def __repr__(self):
+        """
+        Formats and prints a readable verdict.
+        """
+        if self.counterexample is not None:
+            return (
+                f"<SampledVerdict {self.property} fails mod {self.n} | "
+                f"{self.alpha}: {self.counterexample}>"
+            )
+        return (
+            f"<SampledVerdict {self.property} holds mod {self.n} | {self.alpha} "
+            f"for {self.samples} samples: violations < {self.bound():.3g} "
+            f"at {self.confidence:.0%}>"
+        )
+
+    def __bool__(self):
+        """
+        A verdict is true if no counterexample was found.
+        """
+        return self.counterexample is None
+
+    def bound(self):
+        """
+        Returns an upper bound, with the verdict's confidence, on the fraction
+        of tuples that break the property: 1 if a counterexample was found,
+        and otherwise 1 - (1 - confidence)^(1/samples).
+        """
+        if self.counterexample is not None or self.samples == 0:
+            return 1.0
+        return -math.expm1(math.log1p(-self.confidence) / self.samples)
+
+
+def _draw(rng, n, size):
+    """
+    Return size random values below n. Beyond int64, each is built from
+    enough random 62-bit pieces that the bias from reducing mod n is
+    negligible.
+    """
+    if n < INT64_LIMIT:
+        return rng.integers(0, n, size, dtype=np.int64)
+    values = np.zeros(size, dtype=object)
+    for _ in range(n.bit_length() // 62 + 2):
+        values = (values << 62) + rng.integers(0, INT64_LIMIT, size).astype(object)
+    return values % n
+
+
+def _sample(name, n, alpha, arity, broken, samples, batch, confidence, seed):
+    """
+    Draw samples tuples of arity values in batches, returning a
+    SampledVerdict with the first tuple for which broken(backend, *values)
+    is true, if any.
+    """
+    if not 0 < confidence < 1:
+        raise ValueError("Confidence is not between zero and one.")
+    alpha %= n
+    rng = np.random.default_rng(seed)
+    backend = SelectBackend(n)
+
+    drawn = 0
+    while drawn < samples:
+        size = min(batch, samples - drawn)
+        values = [_draw(rng, n, size) for _ in range(arity)]
+        bad = np.flatnonzero(broken(backend, n, alpha, *values))
+        if len(bad):
+            counterexample = tuple(int(v[bad[0]]) for v in values)
+            return SampledVerdict(
+                name, n, alpha, drawn + int(bad[0]) + 1, confidence, counterexample
+            )
+        drawn += size
+    return SampledVerdict(name, n, alpha, drawn, confidence)
+
+
+def _notIdempotent(backend, n, alpha, x):
+    """
+    Return where x * x != x.
+    """
+    return backend.product(x, x, n, alpha) != x
+
+
+def _notCommutative(backend, n, alpha, x, y):
+    """
+    Return where x * y != y * x.
+    """
+    return backend.product(x, y, n, alpha) != backend.product(y, x, n, alpha)
+
+
+def _notAssociative(backend, n, alpha, x, y, z):
+    """
+    Return where (x * y) * z != x * (y * z).
+    """
+    xy = backend.product(x, y, n, alpha)
+    yz = backend.product(y, z, n, alpha)
+    return backend.product(xy, z, n, alpha) != backend.product(x, yz, n, alpha)
+
+
+def HasSuperNumberIdempotentProperty(
+    n, alpha, samples=DEFAULT_SAMPLES, batch=DEFAULT_BATCH, confidence=0.99, seed=None
+):
+    """
+    Tests for given n and alpha whether the equality x * x = x holds for
+    samples random supernumbers, drawn batch at a time.
+    """
+    return _sample(
+        "HasSuperNumberIdempotentProperty",
+        n,
+        alpha,
+        1,
+        _notIdempotent,
+        samples,
+        batch,
+        confidence,
+        seed,
+    )
+
+
+def IsCommutativeSuperNumberMultiplication(
+    n, alpha, samples=DEFAULT_SAMPLES, batch=DEFAULT_BATCH, confidence=0.99, seed=None
+):
+    """
+    Tests for given n and alpha whether the equality x * y = y * x holds for
+    samples random pairs of supernumbers, drawn batch at a time.
+    """
+    return _sample(
+        "IsCommutativeSuperNumberMultiplication",
+        n,
+        alpha,
+        2,
+        _notCommutative,
+        samples,
+        batch,
+        confidence,
+        seed,
+    )
+
+
+def IsAssociativeSuperNumberMultiplication(
+    n, alpha, samples=DEFAULT_SAMPLES, batch=DEFAULT_BATCH, confidence=0.99, seed=None
+):
+    """
+    Tests for given n and alpha whether the equality (x * y) * z = x * (y * z)
+    holds for samples random triples of supernumbers, drawn batch at a time.
+    """
+    return _sample(
+        "IsAssociativeSuperNumberMultiplication",
+        n,
+        alpha,
+        3,
+        _notAssociative,
+        samples,
+        batch,
+        confidence,
+        seed,
+    )
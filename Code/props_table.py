@@ -0,0 +1,85 @@
+"""
+Provides the same functions as props, but answers them from a CayleyTable.
+Each can be given the table to use, such as a memory-mapped one from a
+ResultsStore, rather than building one in memory.
+"""
+
+import numpy as np
+
+import associativity
+from core import SuperNumber
+from table import CayleyTable, MultiplyValues
+
+
+def _checkTable(table, n, alpha):
+    """
+    Make sure a table given to a property function is the one for n and alpha.
+    """
+    if (table.modulus, table.multiplier) != (n, alpha % n):
+        raise ValueError(f"{table} is not the table for {n} and {alpha}")
+
+
+def _diagonal(n, alpha, table):
+    """
+    Return the values of x * x for every x, the diagonal of the Cayley table:
+    from the table if one is given, and otherwise without building the rest
+    of it.
+    """
+    if table is not None:
+        _checkTable(table, n, alpha)
+        return table.diagonal()
+    values = np.arange(n, dtype=np.int64)
+    return MultiplyValues(values, values, n, alpha % n)
+
+
+def HasSuperNumberIdempotentProperty(n, alpha, table=None):
+    """
+    Checks for given n and alpha whether the equality x * x = x holds for all
+    supernumbers
+    """
+
+    return bool(np.array_equal(_diagonal(n, alpha, table), np.arange(n)))
+
+
+def IsCommutativeSuperNumberMultiplication(n, alpha, table=None):
+    """
+    Checks for given n and alpha whether the equality x * y = y * x holds for
+    all supernumbers
+
+    The table is compared with its transpose a block of rows at a time, so a
+    memory-mapped table never has to be loaded whole.
+    """
+
+    if table is None:
+        table = CayleyTable(n, alpha)
+    _checkTable(table, n, alpha)
+    return all(
+        np.array_equal(table.table[rows, :], table.table[:, rows].T)
+        for rows in table.row_blocks()
+    )
+
+
+def IsAssociativeSuperNumberMultiplication(n, alpha, table=None):
+    """
+    Checks for given n and alpha whether the equality (x * y) * z = x * (y * z)
+    hold for all supernumbers
+
+    Checking every triple against the table is O(n³), which dominates a
+    sweep, so this uses Light's test from associativity instead, which only
+    checks the triples whose middle element is one of a few generators.
+    """
+
+    if table is not None:
+        _checkTable(table, n, alpha)
+    return associativity.IsAssociativeSuperNumberMultiplication(n, alpha, table=table)
+
+
+def SuperRootsOfOne(n, alpha, table=None):
+    """
+    Calculates for given n and alpha the list of all elements that satisfy x * x = 1
+    """
+
+    return [
+        SuperNumber(int(x), n, alpha)
+        for x in np.flatnonzero(_diagonal(n, alpha, table) == 1 % n)
+    ]
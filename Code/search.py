@@ -0,0 +1,204 @@
+"""
+Provides functions to search for counterexamples to commutativity and
+associativity for a single large n and alpha, with the work split into shards
+across a pool of processes. As soon as any process finds a counterexample the
+others are stopped.
+"""
+
+import multiprocessing
+import threading
+
+import numpy as np
+
+from table import MultiplyValues
+
+# Set (in each worker) when the search should stop.
+_stop = None
+
+# The table of y * z for the n and alpha a worker is searching, so it's only
+# worked out once per process.
+_products = {}
+
+
+class Counterexample:
+    """
+    Supernumber values for which a property doesn't hold: (x, y) with
+    x * y != y * x, or (x, y, z) with (x * y) * z != x * (y * z).
+    """
+
+    def __init__(self, name, n, alpha, values):
+        """
+        Create a record of a counterexample.
+        """
+        self.property = name
+        self.n = n
+        self.alpha = alpha
+        self.values = values
+
+    def __repr__(self):
+        """
+        Formats and prints a readable counterexample.
+        """
+        return (
+            f"<Counterexample to {self.property} mod {self.n} | {self.alpha}: "
+            f"{self.values}>"
+        )
+
+
+class SearchSummary:
+    """
+    The record of a search that found no counterexample, with how many pairs
+    or triples it checked and in how many shards, as evidence that it covered
+    all of them.
+    """
+
+    def __init__(self, name, n, alpha, checked, shards):
+        """
+        Create a record of a completed search.
+        """
+        self.property = name
+        self.n = n
+        self.alpha = alpha
+        self.checked = checked
+        self.shards = shards
+
+    def __repr__(self):
+        """
+        Formats and prints a readable summary.
+        """
+        return (
+            f"<SearchSummary {self.property} holds mod {self.n} | {self.alpha}: "
+            f"{self.checked} checked in {self.shards} shards>"
+        )
+
+
+def _initWorker(stop):
+    """
+    Remember the event that tells this worker to stop.
+    """
+    global _stop
+    _stop = stop
+
+
+def _commutativeShard(n, alpha, xs):
+    """
+    Check x * y = y * x for each x in xs and every y below x, returning the
+    first pair where it fails, or the number of pairs checked.
+    """
+    checked = 0
+    for x in xs:
+        if _stop.is_set():
+            break
+        ys = np.arange(x)
+        bad = np.flatnonzero(
+            MultiplyValues(x, ys, n, alpha) != MultiplyValues(ys, x, n, alpha)
+        )
+        if len(bad):
+            return (x, int(bad[0]))
+        checked += x
+    return checked
+
+
+def _associativeShard(n, alpha, xs):
+    """
+    Check (x * y) * z = x * (y * z) for each x in xs and every y and z,
+    returning the first triple where it fails, or the number of triples
+    checked.
+    """
+    if (n, alpha) not in _products:
+        _products.clear()
+        values = np.arange(n)
+        _products[n, alpha] = MultiplyValues(values[:, np.newaxis], values, n, alpha)
+    yz = _products[n, alpha]
+    values = np.arange(n)
+
+    checked = 0
+    for x in xs:
+        if _stop.is_set():
+            break
+        xy = MultiplyValues(x, values, n, alpha)
+        bad = np.argwhere(
+            MultiplyValues(xy[:, np.newaxis], values, n, alpha)
+            != MultiplyValues(x, yz, n, alpha)
+        )
+        if len(bad):
+            return (x, int(bad[0][0]), int(bad[0][1]))
+        checked += n * n
+    return checked
+
+
+_SHARD_FUNCTIONS = {
+    "IsCommutativeSuperNumberMultiplication": _commutativeShard,
+    "IsAssociativeSuperNumberMultiplication": _associativeShard,
+}
+
+
+def _runShard(task):
+    """
+    Run one shard in a worker.
+    """
+    name, n, alpha, xs = task
+    return _SHARD_FUNCTIONS[name](n, alpha, xs)
+
+
+def _search(name, n, alpha, processes, shards):
+    """
+    Split the values of x into shards, check them across a pool of processes
+    (or in this process, if processes is 1), and return a Counterexample or a
+    SearchSummary.
+    """
+    alpha %= n
+    if shards is None:
+        shards = min(n, 8 * (processes or multiprocessing.cpu_count()))
+    # Deal x out round-robin, so every shard gets a mix of cheap and
+    # expensive values.
+    tasks = [(name, n, alpha, range(i, n, shards)) for i in range(shards)]
+
+    if processes == 1:
+        _initWorker(threading.Event())
+        try:
+            return _collect(name, n, alpha, map(_runShard, tasks), shards, None)
+        finally:
+            _products.clear()
+
+    stop = multiprocessing.Event()
+    with multiprocessing.Pool(processes, _initWorker, (stop,)) as pool:
+        results = pool.imap_unordered(_runShard, tasks)
+        return _collect(name, n, alpha, results, shards, stop)
+
+
+def _collect(name, n, alpha, results, shards, stop):
+    """
+    Gather shard results, stopping at the first counterexample.
+    """
+    checked = 0
+    for result in results:
+        if isinstance(result, tuple):
+            if stop is not None:
+                stop.set()
+            return Counterexample(name, n, alpha, result)
+        checked += result
+    return SearchSummary(name, n, alpha, checked, shards)
+
+
+def FindCommutativityCounterexample(n, alpha, processes=None, shards=None):
+    """
+    Search for x, y with x * y != y * x, for the given n and alpha, returning
+    the first Counterexample any process finds, or a SearchSummary if there
+    isn't one. By default there is one process per CPU.
+    """
+    return _search(
+        "IsCommutativeSuperNumberMultiplication", n, alpha, processes, shards
+    )
+
+
+def FindAssociativityCounterexample(n, alpha, processes=None, shards=None):
+    """
+    Search for x, y, z with (x * y) * z != x * (y * z), for the given n and
+    alpha, returning the first Counterexample any process finds, or a
+    SearchSummary if there isn't one. By default there is one process per
+    CPU.
+    """
+    return _search(
+        "IsAssociativeSuperNumberMultiplication", n, alpha, processes, shards
+    )
@@ -0,0 +1,282 @@
+"""
+Provides a long-lived query server, so that notebooks and batch jobs can share
+one warm process rather than each recomputing the same results from cold:
+
+$ cd Code
+$ python3 -m supernumber serve --socket /tmp/supernumber.sock
+
+It listens on a Unix socket, or on localhost, and speaks a small JSON
+protocol: each request is one line of JSON, such as
+
+{"id": 1, "method": "SuperRootsOfOne", "n": 10, "alpha": 3}
+
+(with "generators", a list of values, for SuperNumberSetSpan), and is
+answered by one line of JSON with the same id and either a "result" or an
+"error". Lists of supernumbers are sent as lists of their values. The
+"stats" method takes no n or alpha and returns the server's counters.
+
+Results for the most recently used queries are kept in memory, identical
+queries that arrive while one is still being computed wait for that one
+rather than starting another, and heavy queries are sent to a pool of worker
+processes so they don't hold up light ones. client.QueryClient is a thin
+client for it.
+"""
+
+import asyncio
+import functools
+import json
+import os
+import sys
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+
+from core import SuperNumber
+from span import SuperNumberSetSpan
+from sweep import PROPERTIES, EvaluateCell
+
+# The methods the server answers, with the power of n their cost grows with.
+# A span first checks that multiplication commutes, pair by pair, so it costs
+# n² however few generators it's given.
+METHODS = dict(PROPERTIES, SuperNumberSetSpan=2)
+
+
+def _compute(props, method, n, alpha, generators):
+    """
+    Answer one query, returning something that can be sent as JSON.
+    """
+    if method == "SuperNumberSetSpan":
+        span = SuperNumberSetSpan({SuperNumber(g, n, alpha) for g in generators})
+        return sorted(sn.object for sn in span)
+    return EvaluateCell((props, method, n, alpha))["result"]
+
+
+class QueryServer:
+    """
+    Answers queries from any number of clients, caching and coalescing them.
+    Queries whose cost (n to the power given in METHODS) is below
+    inline_below are answered in the server's own process, and the rest in a
+    pool of worker processes (as many as there are CPUs, unless given; if
+    processes is 1, in a thread of this process instead).
+    """
+
+    def __init__(
+        self, cache_size=1024, processes=None, props="props_table", inline_below=10**4
+    ):
+        """
+        Create a server with an empty cache. Nothing is started until start()
+        is awaited.
+        """
+        self.cache_size = cache_size
+        self.processes = processes
+        self.props = props
+        self.inline_below = inline_below
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self._cache = OrderedDict()
+        self._pending = {}
+        self._executor = None
+        self._server = None
+
+    def __repr__(self):
+        """
+        Formats and prints a readable summary of the server's counters.
+        """
+        return (
+            f"<QueryServer {len(self._cache)} cached | {self.hits} hits, "
+            f"{self.misses} misses, {self.coalesced} coalesced>"
+        )
+
+    def stats(self):
+        """
+        Returns the server's counters, as a dict that can be sent as JSON.
+        """
+        return {
+            "cached": len(self._cache),
+            "pending": len(self._pending),
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+        }
+
+    def _key(self, method, n, alpha, generators):
+        """
+        Check a query, returning the key its result is cached under.
+        """
+        if method not in METHODS:
+            raise ValueError(f"Unknown method {method}")
+        if not isinstance(n, int) or not isinstance(alpha, int) or n < 1:
+            raise ValueError("n must be a positive int and alpha an int.")
+        if method == "SuperNumberSetSpan":
+            if not generators or not all(isinstance(g, int) for g in generators):
+                raise ValueError("generators must be a non-empty list of ints.")
+            generators = tuple(sorted({g % n for g in generators}))
+        else:
+            generators = ()
+        return (method, n, alpha % n, generators)
+
+    def _inline(self, method, n):
+        """
+        Check whether a query is cheap enough to answer in the server's own
+        process, without holding up the other clients.
+        """
+        return n ** METHODS[method] < self.inline_below
+
+    async def _run(self, key):
+        """
+        Compute the result for a key, inline if it's cheap, otherwise in the
+        worker pool.
+        """
+        method, n, alpha, generators = key
+        call = functools.partial(_compute, self.props, *key)
+        if self._inline(method, n):
+            return call()
+
+        if self._executor is None and self.processes != 1:
+            self._executor = ProcessPoolExecutor(self.processes)
+        return await asyncio.get_running_loop().run_in_executor(self._executor, call)
+
+    async def query(self, method, n, alpha, generators=()):
+        """
+        Returns the result of a query, from the cache if it's there, or by
+        waiting for an identical query already under way, or else by
+        computing it.
+        """
+        key = self._key(method, n, alpha, generators)
+
+        if key in self._cache:
+            self._cache.move_to_end(key)
+            self.hits += 1
+            return self._cache[key]
+
+        if key in self._pending:
+            self.coalesced += 1
+            return await asyncio.shield(self._pending[key])
+
+        self.misses += 1
+        future = asyncio.get_running_loop().create_future()
+        self._pending[key] = future
+        try:
+            result = await self._run(key)
+        except Exception as e:
+            future.set_exception(e)
+            # Mark it as retrieved, so asyncio doesn't complain if there
+            # were no identical queries waiting for it.
+            future.exception()
+            raise
+        finally:
+            del self._pending[key]
+
+        future.set_result(result)
+        self._cache[key] = result
+        if len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+        return result
+
+    async def _respond(self, line):
+        """
+        Answer one line of a request, returning the line to reply with.
+        """
+        try:
+            request = json.loads(line)
+        except ValueError:
+            return json.dumps({"id": None, "error": "Request is not valid JSON."})
+        if not isinstance(request, dict):
+            return json.dumps({"id": None, "error": "Request is not an object."})
+
+        reply = {"id": request.get("id")}
+        try:
+            if request.get("method") == "stats":
+                reply["result"] = self.stats()
+            else:
+                reply["result"] = await self.query(
+                    request.get("method"),
+                    request.get("n"),
+                    request.get("alpha"),
+                    request.get("generators", ()),
+                )
+        except Exception as e:
+            reply["error"] = str(e) or type(e).__name__
+        return json.dumps(reply)
+
+    async def _handle(self, reader, writer):
+        """
+        Serve one client connection. Its requests are answered concurrently,
+        so replies can arrive in a different order than the requests.
+        """
+        lock = asyncio.Lock()
+
+        async def answer(line):
+            """
+            Answer one request line, writing the reply when it's ready.
+            """
+            reply = await self._respond(line)
+            async with lock:
+                writer.write(reply.encode() + b"\n")
+                await writer.drain()
+
+        tasks = set()
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                if line.strip():
+                    task = asyncio.ensure_future(answer(line))
+                    tasks.add(task)
+                    task.add_done_callback(tasks.discard)
+            if tasks:
+                await asyncio.gather(*tasks, return_exceptions=True)
+        finally:
+            writer.close()
+
+    async def start(self, path=None, host="127.0.0.1", port=0):
+        """
+        Start listening, on the Unix socket at path if it's given, and
+        otherwise on host and port (any free port, if port is 0). Returns the
+        asyncio server.
+        """
+        if path is not None:
+            if os.path.exists(path):
+                os.unlink(path)
+            self._server = await asyncio.start_unix_server(self._handle, path)
+        else:
+            self._server = await asyncio.start_server(self._handle, host, port)
+        return self._server
+
+    async def close(self):
+        """
+        Stop listening and shut down the worker pool.
+        """
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+
+def Serve(path=None, host="127.0.0.1", port=0, **kwargs):
+    """
+    Run a QueryServer until interrupted, printing the address it listens on
+    to stderr. kwargs are passed on to QueryServer.
+    """
+
+    async def run():
+        """
+        Start the server and keep it running until cancelled.
+        """
+        server = QueryServer(**kwargs)
+        listening = await server.start(path, host, port)
+        for sock in listening.sockets:
+            print(f"Listening on {sock.getsockname()}", file=sys.stderr)
+        try:
+            await listening.serve_forever()
+        finally:
+            await server.close()
+
+    try:
+        asyncio.run(run())
+    except KeyboardInterrupt:
+        pass
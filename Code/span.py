@@ -2,7 +2,9 @@
 Provides a function to calculate the span of a set of supernumbers.
 """
 
-from math import prod
+from array import array
+from collections import OrderedDict
+from functools import lru_cache
 
 from supernumber import SuperNumber
 from props_checked import (
@@ -11,45 +13,268 @@ from props_checked import (
 )
 
 
-def SuperNumberSetSpan(generators):
+def CheckGenerators(generators, caller):
     """
-    Calculate the span of a set of "generator" supernumbers, that is, the set
-    of all supernumbers that can be obtained by multiplying together elements
-    of the set.
+    Make sure a set of generators is non-empty and all have the same n and
+    alpha, and return one of them.
     """
 
     if len(generators) == 0:
-        raise ValueError("SuperNumberSetSpan called on empty set")
+        raise ValueError(f"{caller} called on empty set")
 
-    # Make sure sns all have the same n and alpha
     first = next(iter(generators))
     if not all(
         gen.modulus == first.modulus and gen.multiplier == first.multiplier
         for gen in generators
     ):
-        raise ValueError("Mismatched set passed to SuperNumberSetSpan")
+        raise ValueError(f"Mismatched set passed to {caller}")
 
-    # The implementation assumes this is true. We think this is always the
-    # case (and have verified it for n ≤ 50), but since it's not been formally
-    # proven let's make sure.
-    assert IsCommutativeSuperNumberMultiplication(first.modulus, first.multiplier)
+    return first
+
+
+# How many spans SuperNumberSetSpan remembers.
+SPAN_CACHE_SIZE = 128
+
+# Spans computed by SuperNumberSetSpan, keyed by (n, alpha, frozenset of
+# generator values), with the most recently used last.
+_spanCache = OrderedDict()
+
+
+def ClearSpanCache():
+    """
+    Forget every span remembered by SuperNumberSetSpan.
+    """
+    _spanCache.clear()
+
+
+class SuperNumberSpan:
+    """
+    The span of a set of generator supernumbers, stored as a bitset with one
+    bit per value below the modulus, so it takes n/8 bytes however large the
+    span is.
+
+    Like SuperNumberSetSpan, this relies on multiplication being commutative
+    and associative, so that every element of the span is a generator times
+    another element of the span.
+    """
+
+    def __init__(self, generators):
+        """
+        Calculate the span of a non-empty set of supernumbers which all have
+        the same n and alpha.
+        """
+        first = CheckGenerators(generators, "SuperNumberSpan")
+        self.modulus = first.modulus
+        self.multiplier = first.multiplier
+        self.generators = sorted({gen.object for gen in generators})
+        self._bits = bytearray((self.modulus + 7) // 8)
+        self._size = 0
+
+        for gen in self.generators:
+            self._add(gen)
+        self._grow(self.generators)
+
+    def __repr__(self):
+        """
+        Formats and prints a readable span.
+        """
+        return (
+            f"<SuperNumberSpan of {self.generators} mod {self.modulus} "
+            f"| {self.multiplier}>"
+        )
+
+    def copy(self):
+        """
+        Returns an independent copy of this span, which can be extended
+        without affecting this one.
+        """
+        other = SuperNumberSpan.__new__(SuperNumberSpan)
+        other.modulus = self.modulus
+        other.multiplier = self.multiplier
+        other.generators = list(self.generators)
+        other._bits = bytearray(self._bits)
+        other._size = self._size
+        return other
+
+    def extend(self, generators):
+        """
+        Add more generators, which must have the same n and alpha as this
+        span, growing the span in place. Only products involving the new
+        generators are computed.
+        """
+        for sn in generators:
+            if sn.modulus != self.modulus or sn.multiplier != self.multiplier:
+                raise ValueError("Mismatched set passed to SuperNumberSpan.extend")
+
+        for gen in sorted({sn.object for sn in generators} - set(self.generators)):
+            if gen in self:
+                # The span is already closed under multiplication by gen.
+                self.generators.append(gen)
+                continue
+
+            # Everything new is gen times something already in the span (or
+            # gen itself), times any number of generators.
+            factor = (1 + self.multiplier * gen) % self.modulus
+            frontier = [gen]
+            for x in list(self):
+                frontier.append((gen + factor * x) % self.modulus)
+            frontier = [x for x in frontier if self._add(x)]
+
+            self.generators.append(gen)
+            self._grow(frontier)
+
+    def _add(self, x):
+        """
+        Add the value x to the span, returning whether it was new.
+        """
+        byte, bit = x >> 3, 1 << (x & 7)
+        if self._bits[byte] & bit:
+            return False
+        self._bits[byte] |= bit
+        self._size += 1
+        return True
+
+    def _grow(self, frontier):
+        """
+        Close the span under multiplication by the generators, given the
+        values that haven't been multiplied by them yet. Each round only
+        multiplies the values found in the round before.
+        """
+        while frontier:
+            frontier = self._round(frontier)
+
+    def _round(self, frontier):
+        """
+        Multiply each value in frontier by each generator, add the products to
+        the span, and return the ones that weren't already in it.
+        """
+        mod = self.modulus
+        # g * x = g + x + alpha*g*x = g + (1 + alpha*g)*x
+        factors = [(gen, (1 + self.multiplier * gen) % mod) for gen in self.generators]
+        bits = self._bits
 
-    # All of the generators can be obtained by not multiplying them by anything, of course.
-    results = set(generators)
+        found = []
+        for x in frontier:
+            for gen, factor in factors:
+                y = (gen + factor * x) % mod
+                byte, bit = y >> 3, 1 << (y & 7)
+                if not bits[byte] & bit:
+                    bits[byte] |= bit
+                    found.append(y)
+        self._size += len(found)
+        return found
 
-    # Now, take all of the results we know we can obtain, and try multiplying
-    # them by each of the generators to see if we get anything new. Stop once
-    # we stop finding new things.
-    while True:
-        last_len = len(results)
+    def __len__(self):
+        """
+        Returns the number of supernumbers in the span.
+        """
+        return self._size
 
-        for gen in generators:
-            # n.b. create an intermediate set, instead of passing the
-            # comprehension directly as an iterator, so we don't try to update
-            # results while we're iterating it
-            results.update({gen * result for result in results})
+    def __contains__(self, sn):
+        """
+        Checks whether a supernumber (or the integer value of one) is in the
+        span.
+        """
+        if isinstance(sn, SuperNumber):
+            if sn.modulus != self.modulus or sn.multiplier != self.multiplier:
+                return False
+            sn = sn.object
+        return 0 <= sn < self.modulus and bool(self._bits[sn >> 3] & (1 << (sn & 7)))
 
-        if last_len == len(results):
-            break
+    def __iter__(self):
+        """
+        Iterate over the values in the span, in increasing order.
+        """
+        for byte, bits in enumerate(self._bits):
+            if bits:
+                for bit in range(8):
+                    if bits & (1 << bit):
+                        yield byte * 8 + bit
+
+    def as_set(self):
+        """
+        Returns the span as a set of supernumbers.
+        """
+        return {SuperNumber._trusted(x, self.modulus, self.multiplier) for x in self}
+
+    def as_array(self):
+        """
+        Returns the values in the span as a sorted array of unsigned 64-bit
+        integers.
+        """
+        return array("Q", self)
+
+    def as_bitmask(self):
+        """
+        Returns the span as an integer with bit x set for each value x in it.
+        """
+        return int.from_bytes(self._bits, "little")
+
+
+@lru_cache(maxsize=SPAN_CACHE_SIZE)
+def _assertCommutative(n, alpha):
+    """
+    Assert that multiplication is commutative for n and alpha. Since only
+    successful checks are cached, each (n, alpha) only needs to pass once.
+    """
+
+    assert IsCommutativeSuperNumberMultiplication(n, alpha)
+
+
+def _cachedSpan(generators, first):
+    """
+    Return the span of generators, from the cache if it's there. Otherwise,
+    extend the largest cached span whose generators are a subset of these
+    (if there is one) and cache the result.
+    """
+
+    n, alpha = first.modulus, first.multiplier
+    values = frozenset(gen.object for gen in generators)
+    key = (n, alpha, values)
+
+    if key in _spanCache:
+        _spanCache.move_to_end(key)
+        return _spanCache[key]
+
+    best = max(
+        (
+            cached
+            for (cached_n, cached_alpha, cached_values), cached in _spanCache.items()
+            if cached_n == n and cached_alpha == alpha and cached_values <= values
+        ),
+        key=len,
+        default=None,
+    )
+    if best is None:
+        result = SuperNumberSpan(generators)
+    else:
+        result = best.copy()
+        result.extend(generators)
+
+    _spanCache[key] = result
+    if len(_spanCache) > SPAN_CACHE_SIZE:
+        _spanCache.popitem(last=False)
+    return result
+
+
+def SuperNumberSetSpan(generators):
+    """
+    Calculate the span of a set of "generator" supernumbers, that is, the set
+    of all supernumbers that can be obtained by multiplying together elements
+    of the set.
+
+    The most recently calculated spans are remembered, and a span of a
+    superset of earlier generators is built on top of the earlier span.
+    """
+
+    # Make sure sns all have the same n and alpha
+    first = CheckGenerators(generators, "SuperNumberSetSpan")
+
+    # The implementation assumes this is true. We think this is always the
+    # case (and have verified it for n ≤ 50), but since it's not been formally
+    # proven let's make sure.
+    _assertCommutative(first.modulus, first.multiplier)
 
-    return results
\ No newline at end of file
+    # Start from the generators, and keep multiplying each newly found
+    # supernumber by each of the generators until nothing new turns up.
+    return _cachedSpan(generators, first).as_set()
@@ -0,0 +1,126 @@
+"""
+Provides an on-disk store for Cayley tables and property verdicts, so they can
+be reused across sessions, and an interrupted sweep can pick up where it left
+off.
+
+A store is a directory holding:
+
+- tables/<n>_<alpha>.npy: the Cayley table for n and alpha, in NumPy's .npy
+  format, which is memory-mapped when read, so only the rows that are used
+  are loaded
+- verdicts.jsonl: one line of JSON per (property, n, alpha) result, in the
+  same format as a sweep's output
+"""
+
+import json
+import os
+
+import numpy as np
+
+from table import CayleyTable, FillTable, ValueDType
+
+
+class ResultsStore:
+    """
+    A directory of Cayley tables and property verdicts.
+    """
+
+    def __init__(self, directory):
+        """
+        Open the store in directory, creating it if it doesn't exist yet, and
+        read in the verdicts already recorded there. A last line cut short
+        when a sweep was interrupted is removed, so that new verdicts start
+        on a line of their own.
+        """
+        self.directory = directory
+        os.makedirs(os.path.join(directory, "tables"), exist_ok=True)
+        self._verdicts_path = os.path.join(directory, "verdicts.jsonl")
+
+        self._verdicts = {}
+        if os.path.exists(self._verdicts_path):
+            with open(self._verdicts_path, "rb+") as f:
+                end = 0
+                for line in f:
+                    if not line.endswith(b"\n"):
+                        break
+                    end += len(line)
+                    try:
+                        result = json.loads(line)
+                    except ValueError:
+                        continue
+                    self._verdicts[self._key(result)] = result
+                f.truncate(end)
+
+    def __repr__(self):
+        """
+        Formats and prints a readable store.
+        """
+        return f"<ResultsStore {self.directory}>"
+
+    @staticmethod
+    def _key(result):
+        """
+        Return the (property, n, alpha) a result is for.
+        """
+        return (result["property"], result["n"], result["alpha"])
+
+    def __len__(self):
+        """
+        Returns the number of verdicts recorded.
+        """
+        return len(self._verdicts)
+
+    def __contains__(self, cell):
+        """
+        Checks whether there's a verdict for a (property, n, alpha).
+        """
+        return tuple(cell) in self._verdicts
+
+    def get(self, name, n, alpha):
+        """
+        Returns the recorded result for a property, n and alpha, as a dict
+        like those yielded by Sweep, or None if there isn't one.
+        """
+        return self._verdicts.get((name, n, alpha))
+
+    def put(self, result):
+        """
+        Record a result, a dict like those yielded by Sweep, appending it to
+        the verdicts file straight away.
+        """
+        with open(self._verdicts_path, "a") as f:
+            f.write(json.dumps(result) + "\n")
+            f.flush()
+        self._verdicts[self._key(result)] = result
+
+    def table(self, n, alpha):
+        """
+        Returns the CayleyTable for n and alpha, backed by a read-only memory
+        map of the file in the store. If the store doesn't have it yet, it's
+        written first, a block of rows at a time, so it never has to fit in
+        memory.
+        """
+        return StoredTable(self.directory, n, alpha)
+
+
+def StoredTable(directory, n, alpha):
+    """
+    Returns the CayleyTable for n and alpha from the store in directory, as
+    ResultsStore.table does, without reading in the store's verdicts. Worker
+    processes use this to share a store's tables.
+    """
+    path = os.path.join(directory, "tables", f"{n}_{alpha % n}.npy")
+    if not os.path.exists(path):
+        # Write to a temporary file first, so an interrupted write doesn't
+        # leave a partial table behind. Each process writes its own, in case
+        # two of them need the same table at once.
+        partial = f"{path}.{os.getpid()}.partial.npy"
+        table = np.lib.format.open_memmap(
+            partial, mode="w+", dtype=ValueDType(n), shape=(n, n)
+        )
+        FillTable(table, n, alpha % n)
+        table.flush()
+        del table
+        os.replace(partial, path)
+
+    return CayleyTable(n, alpha, table=np.load(path, mmap_mode="r"))
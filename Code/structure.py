@@ -0,0 +1,148 @@
+"""
+Provides an analyzer for the structure of the semigroup of supernumbers for a
+given n and alpha: its group of units, idempotents, maximal subgroups and
+principal ideals, in O(n log n) rather than by searching the Cayley table.
+
+As in cyclic.py, x ↦ u = 1 + alpha*x maps the supernumbers one-to-one into the
+integers mod N = alpha*n, turning supernumber multiplication into ordinary
+multiplication. Everything then follows from d = gcd(u, n), which is also
+gcd(u, N), since u ≡ 1 (mod alpha):
+
+- x * y = x + y*u (mod n), so the principal ideal generated by x (all x * y)
+  is every value congruent to x mod d
+- x is a unit (x * y = 0 for some y) when u is invertible, that is d = 1
+- x is in a subgroup when u^k ≡ u for some k > 1, that is when every prime
+  power of N either divides u or is coprime to it, or equivalently when
+  gcd(d, N/d) = 1. Its idempotent power e is the one with
+  gcd(1 + alpha*e, n) = d, so d labels the maximal subgroup x is in.
+"""
+
+import numpy as np
+
+import congruence
+from table import CayleyTable
+
+# Above this, gcds are worked out with Python ints rather than int64.
+_INT64_LIMIT = 2 ** 62
+
+
+class SemigroupStructure:
+    """
+    The structure of the semigroup of supernumbers for a given n and alpha.
+    Sets of supernumbers are given by their values, as sorted NumPy arrays:
+
+    - units: the group of units, the elements with an inverse
+    - idempotents: the values of e with e * e = e
+    - subgroups: idempotent e -> the maximal subgroup with identity e
+    - roots_of_one: the values of x with x * x = 1
+
+    Multiplication is always commutative and associative, since it's
+    ordinary multiplication in disguise.
+    """
+
+    is_commutative = True
+    is_associative = True
+
+    def __init__(self, mod, mult):
+        """
+        Work out the structure for n (mod) and alpha (mult).
+        """
+        self.modulus = mod
+        self.multiplier = mult % mod
+        n, alpha = mod, self.multiplier
+
+        dtype = np.int64 if alpha * n < _INT64_LIMIT else object
+        values = np.arange(n, dtype=np.int64)
+        self._divisors = np.gcd(1 + alpha * values.astype(dtype), n)
+
+        self.units = np.flatnonzero(self._divisors == 1)
+        self.idempotents = np.array(
+            [e.object for e in congruence.SuperNumberIdempotents(n, alpha)],
+            dtype=np.int64,
+        )
+        self.roots_of_one = np.array(
+            [x.object for x in congruence.SuperRootsOfOne(n, alpha)], dtype=np.int64
+        )
+
+        # With alpha = 0, N is 0 and gcd(d, 0) = d = 1 puts everything in
+        # the group of units, as it should.
+        in_group = np.gcd(self._divisors, (alpha * n) // self._divisors) == 1
+        identities = {int(self._divisors[e]): int(e) for e in self.idempotents}
+        members = np.flatnonzero(in_group)
+        labels = self._divisors[members]
+        self.subgroups = {
+            identities[d]: members[labels == d] for d in sorted(identities)
+        }
+
+    def __repr__(self):
+        """
+        Formats and prints a readable summary.
+        """
+        return (
+            f"<SemigroupStructure mod {self.modulus} | {self.multiplier}: "
+            f"{len(self.units)} units, {len(self.idempotents)} idempotents, "
+            f"{len(self.principal_ideals())} principal ideals>"
+        )
+
+    def has_idempotent_property(self):
+        """
+        Checks whether x * x = x for every supernumber.
+        """
+        return len(self.idempotents) == self.modulus
+
+    def principal_ideal(self, x):
+        """
+        Returns the values in the principal ideal generated by the supernumber
+        with value x (every x * y), as a range.
+        """
+        d = int(self._divisors[x])
+        return range(x % d, self.modulus, d)
+
+    def principal_ideals(self):
+        """
+        Returns every distinct principal ideal, as a dict of (d, r) -> the
+        range of values congruent to r mod d.
+        """
+        return {
+            (d, x % d): range(x % d, self.modulus, d)
+            for x, d in enumerate(map(int, self._divisors))
+        }
+
+
+def _bruteForce(n, alpha):
+    """
+    Work out the units, idempotents, maximal subgroups and principal ideals
+    by searching the Cayley table.
+    """
+    table = CayleyTable(n, alpha).table
+    idempotents = [e for e in range(n) if table[e, e] == e]
+    units = [x for x in range(n) if (table[x] == 0).any()]
+
+    subgroups = {}
+    for e in idempotents:
+        # x is in the group with identity e if x * e = x, and x * y = e for
+        # some y in the same group.
+        candidates = np.flatnonzero(table[e] == np.arange(n))
+        subgroups[e] = [
+            int(x) for x in candidates if (table[x, candidates] == e).any()
+        ]
+
+    ideals = {x: set(table[x].tolist()) for x in range(n)}
+    return units, idempotents, subgroups, ideals
+
+
+def AnalyzeSemigroup(n, alpha, validate=False):
+    """
+    Returns the SemigroupStructure for given n and alpha. If validate is
+    true, the structure is also worked out by brute force, and the two are
+    asserted to be equal.
+    """
+
+    structure = SemigroupStructure(n, alpha)
+    if validate:
+        units, idempotents, subgroups, ideals = _bruteForce(n, alpha)
+        assert structure.units.tolist() == units
+        assert structure.idempotents.tolist() == idempotents
+        assert {e: g.tolist() for e, g in structure.subgroups.items()} == subgroups
+        assert all(set(structure.principal_ideal(x)) == ideals[x] for x in range(n))
+    return structure
@@ -4,4 +4,13 @@ Entry point to the SuperNumbers library'
 
 from core import *
 from props_checked import *
-from span import *
\ No newline at end of file
+from span import *
+from table import CayleyTable
+from arrays import SuperNumberArray
+from memo import GetMemoCache, SetMemoCache
+from version import __version__
+
+if __name__ == "__main__":
+    from cli import main
+
+    main()
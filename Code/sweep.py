@@ -0,0 +1,127 @@
+"""
+Provides functions to run property functions over a grid of (n, alpha) pairs
+in parallel, streaming back each result as soon as it's known.
+"""
+
+import functools
+import importlib
+import json
+import multiprocessing
+
+from store import StoredTable
+
+# The property functions a sweep can run, with the power of n their cost grows
+# with. Expensive cells are handed out first so that no worker is left with a
+# large one at the end of the sweep.
+PROPERTIES = {
+    "HasSuperNumberIdempotentProperty": 1,
+    "IsCommutativeSuperNumberMultiplication": 2,
+    "IsAssociativeSuperNumberMultiplication": 3,
+    "SuperRootsOfOne": 1,
+}
+
+
+def Grid(ns, alphas=None):
+    """
+    Return every (n, alpha) pair for the given values of n. If alphas is not
+    given, every alpha below n is used, otherwise only those in alphas that
+    are below n.
+    """
+    return [
+        (n, alpha)
+        for n in ns
+        for alpha in (range(n) if alphas is None else alphas)
+        if alpha < n
+    ]
+
+
+def EvaluateCell(cell, tables=None):
+    """
+    Run one property for one (n, alpha), and return the result as a dict that
+    can be written out as JSON. Lists of supernumbers become lists of ints.
+    If tables is the directory of a ResultsStore, the property is given the
+    table for n and alpha from there.
+    """
+    props, name, n, alpha = cell
+    kwargs = {}
+    if tables is not None:
+        kwargs["table"] = StoredTable(tables, n, alpha)
+    result = getattr(importlib.import_module(props), name)(n, alpha, **kwargs)
+    if isinstance(result, list):
+        result = [sn.object for sn in result]
+    return {"property": name, "n": n, "alpha": alpha, "result": result}
+
+
+def Sweep(
+    grid,
+    properties=tuple(PROPERTIES),
+    processes=None,
+    props="props_table",
+    store=None,
+    tables=False,
+):
+    """
+    Run each of the named properties for each (n, alpha) in grid, yielding a
+    dict of property, n, alpha and result for each as it finishes. Results
+    arrive in no particular order.
+
+    The work is spread across a pool of processes (as many as there are CPUs,
+    unless given); if processes is 1 everything runs in this process instead.
+    props names the module the property functions are taken from.
+
+    If a ResultsStore is given, results already in it are yielded first
+    without being recomputed, and each new result is recorded in it as soon
+    as it arrives, so an interrupted sweep can be resumed by running it again.
+    If tables is also true, the property functions (which must take a table,
+    as those in props_table do) are run against the store's memory-mapped
+    Cayley tables, so n too large for a table to fit in memory can be swept.
+    """
+    for name in properties:
+        if name not in PROPERTIES:
+            raise ValueError(f"Unknown property {name}")
+    if tables and store is None:
+        raise ValueError("tables needs a store to keep the tables in.")
+
+    cells = sorted(
+        ((props, name, n, alpha) for n, alpha in grid for name in properties),
+        key=lambda cell: cell[2] ** PROPERTIES[cell[1]],
+        reverse=True,
+    )
+
+    if store is not None:
+        for _, name, n, alpha in cells:
+            if (name, n, alpha) in store:
+                yield store.get(name, n, alpha)
+        cells = [cell for cell in cells if cell[1:] not in store]
+
+    directory = store.directory if tables else None
+    for result in _evaluateAll(cells, processes, directory):
+        if store is not None:
+            store.put(result)
+        yield result
+
+
+def _evaluateAll(cells, processes, tables=None):
+    """
+    Evaluate each cell, in this process or a pool of them, yielding results as
+    they finish.
+    """
+    evaluate = functools.partial(EvaluateCell, tables=tables)
+    if processes == 1:
+        yield from map(evaluate, cells)
+        return
+
+    # Hand out one cell at a time, so a worker that draws a cheap cell comes
+    # straight back for more.
+    with multiprocessing.Pool(processes) as pool:
+        yield from pool.imap_unordered(evaluate, cells, chunksize=1)
+
+
+def WriteJSONL(results, stream):
+    """
+    Write each result to stream as a line of JSON, flushing after each one so
+    that it can be read while the sweep is still running.
+    """
+    for result in results:
+        stream.write(json.dumps(result) + "\n")
+        stream.flush()
@@ -0,0 +1,147 @@
+"""
+A NumPy-backed Cayley table holding every product for a given n and alpha.
+"""
+
+import numpy as np
+
+from backend import GetBackend, SelectBackend
+from core import SuperNumber
+
+# The number of entries in a block of rows worked on at once, about 64MB of
+# int64.
+BLOCK_ENTRIES = 2 ** 23
+
+
+def MultiplyValues(x, y, mod, mult, backend=None):
+    """
+    Multiply two integer arrays (or an array and an integer) of supernumber
+    values elementwise, broadcasting as NumPy would, with the given backend
+    or else the one SelectBackend picks for the modulus.
+    """
+    backend = SelectBackend(mod) if backend is None else backend
+    return backend.product(x, y, mod, mult)
+
+
+def ValueDType(mod):
+    """
+    Return the smallest unsigned integer type that can hold every value below
+    the given modulus, or object if none can.
+    """
+    for dtype in (np.uint8, np.uint16, np.uint32, np.uint64):
+        if mod <= np.iinfo(dtype).max + 1:
+            return dtype
+    return object
+
+
+def FillTable(table, mod, mult, rows=None, backend=None):
+    """
+    Fill an existing n×n array with the products for the given modulus and
+    multiplier, a block of rows at a time so that only the block needs to be
+    held in memory at once. By default each block is about 64MB.
+    """
+    if rows is None:
+        rows = max(1, BLOCK_ENTRIES // mod)
+    values = np.arange(mod, dtype=np.int64)
+    for start in range(0, mod, rows):
+        block = values[start : start + rows, np.newaxis]
+        table[start : start + rows, :] = MultiplyValues(
+            block, values, mod, mult, backend
+        )
+
+
+class CayleyTable:
+    """
+    The full n×n multiplication table for the supernumbers with a given
+    modulus and multiplier, built in one broadcast operation. Entry [x, y]
+    holds the value of x * y.
+    """
+
+    def __init__(self, mod, mult, table=None, backend=None):
+        """
+        Build the table for the given modulus and multiplier. If table is
+        given (for example a memory-mapped array from a ResultsStore), it's
+        used as the table instead of building a new one. backend is the name
+        of the backend to build it with; by default SelectBackend chooses.
+        """
+        if not type(mod) is int:
+            raise TypeError("Modulus is not an int.")
+        if mod <= 0:
+            raise Exception("Modulus is not greater than zero.")
+        if not type(mult) is int:
+            raise TypeError("Multiplier is not an int.")
+        if mult < 0:
+            raise Exception("Multiplier is not greater than zero.")
+        self.modulus = mod
+        self.multiplier = mult % mod
+        self.backend = SelectBackend(mod) if backend is None else GetBackend(backend)
+
+        if table is not None:
+            if table.shape != (mod, mod):
+                raise ValueError(f"Table for {mod} has shape {table.shape}")
+            self.table = table
+            return
+
+        values = np.arange(mod, dtype=np.int64)
+        self.table = MultiplyValues(
+            values[:, np.newaxis],
+            values[np.newaxis, :],
+            mod,
+            self.multiplier,
+            self.backend,
+        ).astype(ValueDType(mod))
+
+    def __repr__(self):
+        """
+        Formats and prints a readable table description.
+        """
+        return f"<CayleyTable mod {self.modulus} | {self.multiplier}>"
+
+    def _index(self, sn):
+        """
+        Accept either a plain integer or a compatible supernumber, and return
+        the integer to index the table with.
+        """
+        if isinstance(sn, SuperNumber):
+            if self.modulus != sn.modulus or self.multiplier != sn.multiplier:
+                raise Exception(f"Supernumber {sn} is not compatible with {self}")
+            return sn.object
+        return sn
+
+    def product(self, x, y):
+        """
+        Look up x * y in the table, returning a supernumber.
+        """
+        return SuperNumber(
+            int(self.table[self._index(x), self._index(y)]),
+            self.modulus,
+            self.multiplier,
+        )
+
+    def row(self, x):
+        """
+        Return the values of x * y for every y, as a view into the table.
+        """
+        return self.table[self._index(x), :]
+
+    def column(self, y):
+        """
+        Return the values of x * y for every x, as a view into the table.
+        """
+        return self.table[:, self._index(y)]
+
+    def row_blocks(self, rows=None):
+        """
+        Yield slices covering the rows of the table a block at a time, about
+        BLOCK_ENTRIES entries each unless rows is given, so that a
+        memory-mapped table can be worked through without loading all of it.
+        """
+        if rows is None:
+            rows = max(1, BLOCK_ENTRIES // self.modulus)
+        for start in range(0, self.modulus, rows):
+            yield slice(start, min(start + rows, self.modulus))
+
+    def diagonal(self):
+        """
+        Return the values of x * x for every x.
+        """
+        return self.table.diagonal()
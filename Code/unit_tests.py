@@ -1,8 +1,41 @@
+import asyncio
+import io
+import json
+import os
+import tempfile
+import threading
 import unittest
-from core import SuperNumber, SuperNumbers
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
+
+import numpy as np
+
+from core import SuperNumber, SuperNumbers, clear_intern_pools
+import associativity
+import backend
+import benchmarks
+import congruence
+import core
+import crt
+import fold
+from instrument import Instrumentation
+import lattice
+import memo
 import props
+import props_checked
+import props_sampled
 import props_supernumbers
+import props_table
+import search
+import server
+from client import QueryClient
+import primes
 import span
+import structure
+from store import ResultsStore
+import sweep
+from table import CayleyTable, FillTable
+from arrays import SuperNumberArray
 
 
 class SuperNumberTests(unittest.TestCase):
@@ -99,6 +132,59 @@ class SuperNumberTests(unittest.TestCase):
         with self.assertRaisesRegex(Exception, "Modulus is not greater than zero"):
             SuperNumber(2, -1, 5)
 
+    def test_no_instance_dict(self):
+        with self.assertRaises(AttributeError):
+            SuperNumber(1, 3, 2).other = 1
+
+    def test_pow(self):
+        x = SuperNumber(5, 12, 3)
+        self.assertEqual(x ** 0, SuperNumber(0, 12, 3))
+        self.assertEqual(x ** 1, x)
+        self.assertEqual(x ** 4, x * x * x * x)
+
+    def test_pow_matches_repeated_multiplication(self):
+        for n in range(1, 20):
+            for alpha in range(n):
+                for x in SuperNumbers(n, alpha):
+                    power = SuperNumber(0, n, alpha)
+                    for k in range(6):
+                        self.assertEqual(x ** k, power)
+                        power = power * x
+
+    def test_large_pow(self):
+        x = SuperNumber(3, 10 ** 30, 7)
+        self.assertEqual(x ** (2 ** 100), (x ** (2 ** 99)) * (x ** (2 ** 99)))
+
+    def test_pow_not_int(self):
+        with self.assertRaisesRegex(TypeError, "Exponent is not an int"):
+            SuperNumber(1, 3, 2) ** 1.0
+
+    def test_pow_less_than_zero(self):
+        with self.assertRaisesRegex(Exception, "Exponent is not greater than zero"):
+            SuperNumber(1, 3, 2) ** -1
+
+    def test_index_and_period(self):
+        for n in range(1, 20):
+            for alpha in range(n):
+                for x in SuperNumbers(n, alpha):
+                    powers = [x]
+                    while powers[-1] * x not in powers:
+                        powers.append(powers[-1] * x)
+                    index = powers.index(powers[-1] * x) + 1
+                    period = len(powers) + 1 - index
+                    self.assertEqual(x.index_and_period(), (index, period))
+                    self.assertEqual(x.order(), len(powers))
+
+    def test_order_of_unit(self):
+        # 2 * 10 = 2 + 10 + 3*2*10 = 72 = 0 (mod 12), so 2 has an inverse
+        x = SuperNumber(2, 12, 3)
+        self.assertEqual(x.order(), 6)
+        self.assertEqual(x ** 6, SuperNumber(0, 12, 3))
+        self.assertNotEqual(x ** 3, SuperNumber(0, 12, 3))
+
+    def test_trusted(self):
+        self.assertEqual(SuperNumber._trusted(2, 5, 3), SuperNumber(2, 5, 3))
+
 
 class SuperNumbersTests(unittest.TestCase):
     def test_init_mod_not_int(self):
@@ -164,6 +250,82 @@ class SuperNumbersTests(unittest.TestCase):
         with self.assertRaisesRegex(Exception, "is not compatible"):
             SuperNumbers(3, 2).iter_below(SuperNumber(0, 3, 1))
 
+    def test_orders(self):
+        sns = SuperNumbers(12, 4)
+        self.assertEqual(sns.orders(), [x.order() for x in sns])
+        self.assertEqual(
+            sns.index_and_periods(), [x.index_and_period() for x in sns]
+        )
+
+    def test_interned_iteration(self):
+        clear_intern_pools()
+        first = list(SuperNumbers(5, 2, interned=True))
+        second = list(SuperNumbers(5, 2, interned=True))
+        self.assertEqual(first, list(SuperNumbers(5, 2)))
+        self.assertTrue(all(x is y for x, y in zip(first, second)))
+        below = SuperNumbers(5, 2, interned=True).iter_below(SuperNumber(3, 5, 2))
+        self.assertTrue(all(x is y for x, y in zip(first, below)))
+
+    def test_intern_pools_are_bounded(self):
+        clear_intern_pools()
+        first = SuperNumbers(5, 2, interned=True)[3]
+        for n in range(6, 6 + core.INTERN_POOL_COUNT - 1):
+            SuperNumbers(n, 2, interned=True)[0]
+        self.assertIs(first, SuperNumbers(5, 2, interned=True)[3])
+        SuperNumbers(1000, 2, interned=True)[0]
+        self.assertEqual(core.INTERN_POOL_COUNT, len(core._intern_pools))
+        self.assertNotIn((6, 2), core._intern_pools)
+        self.assertIn((5, 2), core._intern_pools)
+
+    def test_fresh_iteration(self):
+        first = list(SuperNumbers(5, 2))
+        second = list(SuperNumbers(5, 2))
+        self.assertFalse(any(x is y for x, y in zip(first, second)))
+
+    def test_len_and_contains(self):
+        sns = SuperNumbers(10, 3)
+        self.assertEqual(10, len(sns))
+        self.assertTrue(SuperNumber(4, 10, 3) in sns)
+        self.assertFalse(SuperNumber(4, 10, 2) in sns)
+        self.assertFalse(SuperNumber(4, 11, 3) in sns)
+        self.assertFalse(4 in sns)
+
+    def test_getitem(self):
+        sns = SuperNumbers(10, 3)
+        self.assertEqual(SuperNumber(4, 10, 3), sns[4])
+        self.assertEqual(SuperNumber(9, 10, 3), sns[-1])
+        with self.assertRaises(IndexError):
+            sns[10]
+
+    def test_slicing(self):
+        sns = SuperNumbers(10, 3)
+        view = sns[8:2:-2]
+        self.assertEqual([sns[8], sns[6], sns[4]], list(view))
+        self.assertEqual(3, len(view))
+        self.assertEqual(sns[4], view[-1])
+        self.assertEqual([sns[6]], list(view[1:2]))
+        self.assertTrue(sns[6] in view)
+        self.assertFalse(sns[5] in view)
+        self.assertFalse(sns[20:])
+
+    def test_huge_modulus(self):
+        n = 10**100
+        sns = SuperNumbers(n, 7)
+        self.assertTrue(sns)
+        self.assertEqual(n, sns.size())
+        self.assertEqual(SuperNumber(n - 1, n, 7), sns[-1])
+        evens = sns[::2]
+        self.assertEqual(n // 2, evens.size())
+        self.assertEqual(SuperNumber(n - 2, n, 7), evens[-1])
+        self.assertTrue(SuperNumber(n - 2, n, 7) in evens)
+        self.assertFalse(SuperNumber(n - 1, n, 7) in evens)
+
+    def test_interned_getitem(self):
+        clear_intern_pools()
+        sns = SuperNumbers(5, 2, interned=True)
+        self.assertIs(sns[3], sns[3])
+        self.assertIs(sns[3], sns[1:][2])
+
 
 # Tests for both implementations of props
 #
@@ -213,6 +375,383 @@ class SuperNumbersPropsTests(PropsTests, unittest.TestCase):
         self.props = props_supernumbers
 
 
+class CheckedPropsTests(PropsTests, unittest.TestCase):
+    def setUp(self):
+        self.props = props_checked
+
+
+class SampledPropsTests(unittest.TestCase):
+    def test_holds(self):
+        for n in [40, 10**12 + 39, 10**30]:
+            verdict = props_sampled.IsAssociativeSuperNumberMultiplication(
+                n, 7, samples=3000, batch=1000, seed=1
+            )
+            self.assertTrue(verdict)
+            self.assertEqual(3000, verdict.samples)
+            self.assertTrue(
+                props_sampled.IsCommutativeSuperNumberMultiplication(n, 7, samples=3000)
+            )
+
+    def test_bound(self):
+        verdict = props_sampled.SampledVerdict("p", 10, 3, 1000, 0.95)
+        # With no violations in 1000 samples, at 95% confidence the
+        # violating fraction is below about 3/1000
+        self.assertAlmostEqual(1 - 0.05 ** (1 / 1000), verdict.bound())
+        self.assertAlmostEqual(0.003, verdict.bound(), places=3)
+
+    def test_counterexample(self):
+        verdict = props_sampled.HasSuperNumberIdempotentProperty(10**12, 7, seed=1)
+        self.assertFalse(verdict)
+        self.assertEqual(1.0, verdict.bound())
+        (x,) = verdict.counterexample
+        sn = SuperNumber(x, 10**12, 7)
+        self.assertNotEqual(sn, sn * sn)
+        self.assertTrue(props_sampled.HasSuperNumberIdempotentProperty(2, 1))
+
+    # x + 2y is neither commutative nor associative
+    @mock.patch.object(
+        backend.NumPyBackend, "product", lambda self, x, y, n, alpha: (x + 2 * y) % n
+    )
+    def test_stops_early(self):
+        verdict = props_sampled.IsAssociativeSuperNumberMultiplication(
+            30, 7, samples=10**9, batch=1000, seed=1
+        )
+        self.assertFalse(verdict)
+        self.assertLessEqual(verdict.samples, 1000)
+        x, y, z = verdict.counterexample
+        self.assertNotEqual(
+            ((x + 2 * y) % 30 + 2 * z) % 30, (x + 2 * ((y + 2 * z) % 30)) % 30
+        )
+
+    def test_bad_confidence(self):
+        with self.assertRaises(ValueError):
+            props_sampled.IsCommutativeSuperNumberMultiplication(10, 3, confidence=1)
+
+
+class VerificationPolicyTests(unittest.TestCase):
+    # Every call needs to reach the policy, rather than the memo cache.
+    def setUp(self):
+        memo.SetMemoCache(0)
+
+    def tearDown(self):
+        props_checked.SetVerificationPolicy(props_checked.VerificationPolicy.ALWAYS)
+        memo.SetMemoCache()
+
+    def call(self, times=10, n=5):
+        for _ in range(times):
+            props_checked.IsCommutativeSuperNumberMultiplication(n, 2)
+
+    def test_always(self):
+        policy = props_checked.SetVerificationPolicy("always")
+        self.call()
+        self.assertEqual((policy.calls, policy.checks), (10, 10))
+
+    def test_never(self):
+        policy = props_checked.SetVerificationPolicy("never")
+        self.call()
+        self.assertEqual((policy.calls, policy.checks), (10, 0))
+
+    def test_sampled(self):
+        policy = props_checked.SetVerificationPolicy("sampled", fraction=0.5, seed=1)
+        self.call(200)
+        self.assertEqual(policy.calls, 200)
+        self.assertTrue(50 < policy.checks < 150)
+
+    def test_below_size(self):
+        policy = props_checked.SetVerificationPolicy("below_size", threshold=6)
+        self.call(3, n=5)
+        self.call(3, n=6)
+        self.assertEqual((policy.calls, policy.checks), (6, 3))
+
+    def test_get_policy(self):
+        policy = props_checked.SetVerificationPolicy("never")
+        self.assertIs(props_checked.GetVerificationPolicy(), policy)
+
+    def test_unknown_mode(self):
+        with self.assertRaises(ValueError):
+            props_checked.VerificationPolicy("sometimes")
+
+    def test_bad_fraction(self):
+        with self.assertRaises(ValueError):
+            props_checked.VerificationPolicy("sampled", fraction=2)
+
+    def test_disagreement(self):
+        policy = props_checked.GetVerificationPolicy()
+        with mock.patch.object(props_supernumbers, "SuperRootsOfOne", return_value=[]):
+            with self.assertRaises(AssertionError):
+                props_checked.SuperRootsOfOne(3, 2)
+        self.assertEqual(policy.disagreements, 1)
+
+    def test_reset_counters(self):
+        policy = props_checked.GetVerificationPolicy()
+        self.call()
+        policy.reset_counters()
+        self.assertEqual((policy.calls, policy.checks), (0, 0))
+
+
+class MemoCacheTests(unittest.TestCase):
+    def tearDown(self):
+        memo.SetMemoCache()
+
+    def test_memoized(self):
+        cache = memo.SetMemoCache()
+        first = props_checked.SuperRootsOfOne(13, 2)
+        with mock.patch.object(props, "SuperRootsOfOne") as computed:
+            self.assertEqual(first, props_checked.SuperRootsOfOne(13, 2))
+        computed.assert_not_called()
+        self.assertEqual((1, 1), (cache.hits, cache.misses))
+
+    def test_memoized_reduces_alpha(self):
+        cache = memo.SetMemoCache()
+        first = props_checked.SuperRootsOfOne(5, 2)
+        with mock.patch.object(props, "SuperRootsOfOne") as computed:
+            self.assertEqual(first, props_checked.SuperRootsOfOne(5, 7))
+        computed.assert_not_called()
+        self.assertEqual((1, 1), (cache.hits, cache.misses))
+
+    def test_lru_eviction(self):
+        cache = memo.MemoCache(maxsize=2)
+        for n in [3, 4, 5]:
+            cache.put("f", n, 1, n)
+        self.assertIs(memo.MISSING, cache.get("f", 3, 1))
+        self.assertEqual(5, cache.get("f", 5, 1))
+
+    def test_disabled(self):
+        memo.SetMemoCache(0)
+        props_checked.IsCommutativeSuperNumberMultiplication(5, 2)
+        with mock.patch.object(
+            props, "IsCommutativeSuperNumberMultiplication", return_value=True
+        ) as computed:
+            props_checked.IsCommutativeSuperNumberMultiplication(5, 2)
+        computed.assert_called_once_with(5, 2)
+
+    def test_database(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "memo.sqlite")
+            memo.SetMemoCache(path=path)
+            roots = props_checked.SuperRootsOfOne(15, 3)
+
+            # A new session, with nothing in memory.
+            cache = memo.SetMemoCache(path=path)
+            with mock.patch.object(props, "SuperRootsOfOne") as computed:
+                self.assertEqual(roots, props_checked.SuperRootsOfOne(15, 3))
+            computed.assert_not_called()
+            self.assertEqual(1, cache.hits)
+
+            # A new version doesn't reuse old results.
+            cache = memo.MemoCache(path=path, version="0")
+            self.assertIs(memo.MISSING, cache.get("SuperRootsOfOne", 15, 3))
+
+            # n too large for an SQLite integer
+            cache.put("SuperRootsOfOne", 10**20, 3, [SuperNumber(1, 10**20, 3)])
+            cache.clear()
+            self.assertEqual(
+                [SuperNumber(1, 10**20, 3)], cache.get("SuperRootsOfOne", 10**20, 3)
+            )
+
+    def test_database_from_threads(self):
+        with tempfile.TemporaryDirectory() as directory:
+            # Nothing in memory, so every get goes to the database.
+            path = os.path.join(directory, "memo.sqlite")
+            cache = memo.MemoCache(maxsize=0, path=path)
+            cache.put("SuperRootsOfOne", 3, 2, [SuperNumber(1, 3, 2)])
+
+            def use(n):
+                cache.put("SuperRootsOfOne", n, 2, [SuperNumber(1, n, 2)])
+                return cache.get("SuperRootsOfOne", n, 2)
+
+            with ThreadPoolExecutor(4) as executor:
+                results = list(executor.map(use, range(3, 23)))
+            self.assertEqual([[SuperNumber(1, n, 2)] for n in range(3, 23)], results)
+
+
+class TablePropsTests(PropsTests, unittest.TestCase):
+    def setUp(self):
+        self.props = props_table
+
+    def test_diagonal_without_table(self):
+        with mock.patch.object(props_table, "CayleyTable") as built:
+            props_table.HasSuperNumberIdempotentProperty(12, 5)
+            props_table.SuperRootsOfOne(12, 5)
+        built.assert_not_called()
+
+
+class CayleyTableTests(unittest.TestCase):
+    def test_str(self):
+        self.assertEqual(str(CayleyTable(3, 5)), "<CayleyTable mod 3 | 2>")
+
+    def test_matches_multiplication(self):
+        table = CayleyTable(7, 3)
+        for x in range(7):
+            for y in range(7):
+                expected = SuperNumber(x, 7, 3) * SuperNumber(y, 7, 3)
+                self.assertEqual(table.table[x, y], expected.object)
+
+    def test_product(self):
+        table = CayleyTable(5, 2)
+        self.assertEqual(
+            table.product(SuperNumber(3, 5, 2), SuperNumber(4, 5, 2)),
+            SuperNumber(1, 5, 2),
+        )
+
+    def test_product_mismatched(self):
+        with self.assertRaisesRegex(Exception, "is not compatible"):
+            CayleyTable(5, 2).product(SuperNumber(3, 5, 1), 4)
+
+    def test_views(self):
+        table = CayleyTable(4, 1)
+        self.assertEqual(list(table.row(1)), [1, 3, 1, 3])
+        self.assertEqual(list(table.column(1)), [1, 3, 1, 3])
+        self.assertEqual(list(table.diagonal()), [0, 3, 0, 3])
+
+    def test_agrees_with_props(self):
+        for n in range(1, 12):
+            for alpha in range(n):
+                self.assertEqual(
+                    props.SuperRootsOfOne(n, alpha),
+                    props_table.SuperRootsOfOne(n, alpha),
+                )
+                self.assertEqual(
+                    props.IsAssociativeSuperNumberMultiplication(n, alpha),
+                    props_table.IsAssociativeSuperNumberMultiplication(n, alpha),
+                )
+
+
+class SuperNumberArrayTests(unittest.TestCase):
+    def test_str(self):
+        self.assertEqual(
+            str(SuperNumberArray([1, 4], 3, 5)), "<SuperNumberArray [1, 1] mod 3 | 2>"
+        )
+
+    def test_init_values_not_int(self):
+        with self.assertRaisesRegex(TypeError, "Values are not ints"):
+            SuperNumberArray([1.5], 3, 2)
+
+    def test_init_values_less_than_zero(self):
+        with self.assertRaisesRegex(Exception, "Values are not greater than zero"):
+            SuperNumberArray([-1], 3, 2)
+
+    def test_mult(self):
+        x = SuperNumberArray([3, 1, 4], 5, 2)
+        y = SuperNumberArray([4, 2, 4], 5, 2)
+        pairs = [(3, 4), (1, 2), (4, 4)]
+        expected = [SuperNumber(a, 5, 2) * SuperNumber(b, 5, 2) for a, b in pairs]
+        self.assertEqual((x * y).to_list(), expected)
+
+    def test_mult_by_supernumber(self):
+        x = SuperNumberArray([0, 1, 2], 5, 2)
+        self.assertEqual(
+            (x * SuperNumber(3, 5, 2)).to_list(),
+            [SuperNumber(v, 5, 2) * SuperNumber(3, 5, 2) for v in range(3)],
+        )
+
+    def test_mult_for_different_mod_or_mult(self):
+        with self.assertRaisesRegex(
+            Exception, "Modulus and multiplier are not the same"
+        ):
+            SuperNumberArray([1], 5, 2) * SuperNumberArray([1], 5, 1)
+
+    def test_outer_matches_table(self):
+        sns = SuperNumberArray.from_supernumbers(SuperNumbers(6, 4))
+        self.assertTrue((sns.outer(sns).values == CayleyTable(6, 4).table).all())
+
+    def test_eq(self):
+        x = SuperNumberArray([1, 2, 1], 5, 2)
+        self.assertEqual((x == SuperNumber(1, 5, 2)).tolist(), [True, False, True])
+        self.assertEqual((x == SuperNumber(1, 5, 1)).tolist(), [False] * 3)
+
+    def test_unique(self):
+        x = SuperNumberArray([3, 1, 3, 0], 5, 2)
+        self.assertEqual(x.unique().values.tolist(), [0, 1, 3])
+
+    def test_getitem(self):
+        x = SuperNumberArray([3, 1, 4], 5, 2)
+        self.assertEqual(x[1], SuperNumber(1, 5, 2))
+        self.assertEqual(x[1:].to_list(), [SuperNumber(1, 5, 2), SuperNumber(4, 5, 2)])
+
+    def test_round_trip(self):
+        sns = [SuperNumber(2, 7, 3), SuperNumber(5, 7, 3)]
+        x = SuperNumberArray.from_list(sns)
+        self.assertEqual(x.to_list(), sns)
+        self.assertEqual(x.supernumbers(), SuperNumbers(7, 3))
+
+    def test_from_list_mismatched(self):
+        with self.assertRaises(ValueError):
+            SuperNumberArray.from_list([SuperNumber(2, 7, 3), SuperNumber(2, 7, 1)])
+
+    def test_from_empty_list(self):
+        with self.assertRaises(ValueError):
+            SuperNumberArray.from_list([])
+
+
+class BackendTests(unittest.TestCase):
+    def test_select(self):
+        self.assertEqual("numpy", backend.SelectBackend(10).name)
+        self.assertEqual("numpy", backend.SelectBackend(2**62 - 1).name)
+        self.assertEqual("object", backend.SelectBackend(2**62).name)
+        self.assertEqual("python", backend.SelectBackend(10, vectorized=False).name)
+        self.assertEqual("object", SuperNumbers(10**30, 7).backend.name)
+        self.assertEqual("object", SuperNumbers(10, 7, backend="object").backend.name)
+
+    def test_get(self):
+        numpy_backend = backend.GetBackend("numpy")
+        self.assertIs(numpy_backend, backend.GetBackend(numpy_backend))
+        with self.assertRaises(ValueError):
+            backend.GetBackend("fortran")
+
+    def test_products(self):
+        # Either side of each point where the numpy backend changes method
+        for n in [3037000499, 3037000500, 2**62 - 57, 2**62 + 1, 10**30]:
+            for name in ["python", "numpy", "object"]:
+                if name == "numpy" and n >= 2**62:
+                    continue
+                b = backend.GetBackend(name)
+                for x, y, alpha in [(n - 1, n - 2, n - 3), (n // 3, n // 7, 5)]:
+                    self.assertEqual(
+                        (x + y + alpha * x * y) % n,
+                        int(b.product(b.asarray(x), b.asarray(y), n, alpha)),
+                    )
+
+    def test_numpy_overflow(self):
+        with self.assertRaises(OverflowError):
+            backend.GetBackend("numpy").product(1, 2, 2**62, 3)
+
+    def test_huge_array(self):
+        n = 10**30
+        array = SuperNumberArray([n // 10, 5], n, 7)
+        self.assertEqual("object", array.backend.name)
+        self.assertEqual([x * x for x in array.to_list()], (array * array).to_list())
+
+    def test_tables_agree(self):
+        for name in ["numpy", "object"]:
+            table = CayleyTable(12, 5, backend=name)
+            self.assertEqual(name, table.backend.name)
+            np.testing.assert_array_equal(CayleyTable(12, 5).table, table.table)
+
+
+class AssociativityTests(unittest.TestCase):
+    def test_generating_set_spans_everything(self):
+        for n, alpha in [(1, 0), (6, 0), (12, 4), (13, 2)]:
+            generators = associativity.GeneratingSet(n, alpha)
+            self.assertEqual(
+                span.SuperNumberSetSpan(generators), set(SuperNumbers(n, alpha))
+            )
+
+    def test_generating_set_is_small(self):
+        # 1 on its own generates everything when alpha is zero
+        expected = [SuperNumber(0, 10, 0), SuperNumber(1, 10, 0)]
+        self.assertEqual(associativity.GeneratingSet(10, 0), expected)
+
+    def test_agrees_with_brute_force(self):
+        for n in range(1, 12):
+            for alpha in range(n):
+                self.assertTrue(
+                    associativity.IsAssociativeSuperNumberMultiplication(
+                        n, alpha, cross_check=True
+                    )
+                )
+
+
 class SpanTests(unittest.TestCase):
     def test_set_span_of_inconsistent_set(self):
         with self.assertRaises(ValueError):
@@ -246,5 +785,715 @@ class SpanTests(unittest.TestCase):
         self.assertEqual(expected, span.SuperNumberSetSpan(generators))
 
 
+class SpanCacheTests(unittest.TestCase):
+    def setUp(self):
+        span.ClearSpanCache()
+
+    def test_repeated_query(self):
+        generators = {SuperNumber(4, 13, 2)}
+        first = span.SuperNumberSetSpan(generators)
+        first.add(SuperNumber(5, 13, 2))
+        expected = {SuperNumber(x, 13, 2) for x in [0, 1, 4]}
+        self.assertEqual(span.SuperNumberSetSpan(generators), expected)
+        self.assertEqual(len(span._spanCache), 1)
+
+    def test_superset_query(self):
+        span.SuperNumberSetSpan({SuperNumber(4, 13, 2)})
+        larger = {SuperNumber(4, 13, 2), SuperNumber(2, 13, 2)}
+        self.assertEqual(
+            span.SuperNumberSetSpan(larger), span.SuperNumberSpan(larger).as_set()
+        )
+        self.assertEqual(len(span._spanCache), 2)
+
+    def test_bounded(self):
+        for x in range(span.SPAN_CACHE_SIZE + 10):
+            span.SuperNumberSetSpan({SuperNumber(x, 1000, 3)})
+        self.assertEqual(len(span._spanCache), span.SPAN_CACHE_SIZE)
+
+
+class SuperNumberSpanTests(unittest.TestCase):
+    def test_span_of_empty_set(self):
+        with self.assertRaises(ValueError):
+            span.SuperNumberSpan([])
+
+    def test_span_of_inconsistent_set(self):
+        with self.assertRaises(ValueError):
+            span.SuperNumberSpan([SuperNumber(1, 3, 2), SuperNumber(1, 4, 2)])
+
+    def test_outputs(self):
+        s = span.SuperNumberSpan([SuperNumber(4, 13, 2), SuperNumber(6, 13, 2)])
+        self.assertEqual(len(s), 4)
+        self.assertEqual(list(s.as_array()), [0, 1, 4, 6])
+        self.assertEqual(s.as_bitmask(), 0b1010011)
+        self.assertEqual(s.as_set(), {SuperNumber(x, 13, 2) for x in [0, 1, 4, 6]})
+
+    def test_contains(self):
+        s = span.SuperNumberSpan([SuperNumber(2, 4, 0)])
+        self.assertIn(SuperNumber(0, 4, 0), s)
+        self.assertIn(2, s)
+        self.assertNotIn(SuperNumber(1, 4, 0), s)
+        self.assertNotIn(SuperNumber(0, 4, 1), s)
+        self.assertNotIn(4, s)
+
+    def test_agrees_with_brute_force(self):
+        for n in range(1, 16):
+            for alpha in range(n):
+                for x in range(n):
+                    for y in range(x, n):
+                        generators = [
+                            SuperNumber(x, n, alpha),
+                            SuperNumber(y, n, alpha),
+                        ]
+                        expected = set(generators)
+                        while True:
+                            products = {a * b for a in expected for b in expected}
+                            if products <= expected:
+                                break
+                            expected |= products
+                        self.assertEqual(
+                            span.SuperNumberSpan(generators).as_set(), expected
+                        )
+
+    def test_extend(self):
+        s = span.SuperNumberSpan([SuperNumber(4, 13, 2)])
+        s.extend([SuperNumber(6, 13, 2)])
+        self.assertEqual(s.as_set(), {SuperNumber(x, 13, 2) for x in [0, 1, 4, 6]})
+        self.assertEqual(s.generators, [4, 6])
+
+    def test_extend_mismatched(self):
+        with self.assertRaises(ValueError):
+            s = span.SuperNumberSpan([SuperNumber(4, 13, 2)])
+            s.extend([SuperNumber(1, 13, 1)])
+
+    def test_extend_matches_fresh_span(self):
+        for n in range(1, 10):
+            for alpha in range(n):
+                for x in range(n):
+                    s = span.SuperNumberSpan([SuperNumber(x, n, alpha)])
+                    for y in range(n):
+                        generators = [SuperNumber(v, n, alpha) for v in range(y + 1)]
+                        s.extend([SuperNumber(y, n, alpha)])
+                        generators.append(SuperNumber(x, n, alpha))
+                        expected = span.SuperNumberSpan(generators)
+                        self.assertEqual(s.as_bitmask(), expected.as_bitmask())
+                        self.assertEqual(len(s), len(expected))
+
+    def test_copy(self):
+        s = span.SuperNumberSpan([SuperNumber(2, 13, 2)])
+        t = s.copy()
+        t.extend([SuperNumber(1, 13, 2)])
+        self.assertEqual(s.generators, [2])
+        self.assertLess(len(s), len(t))
+
+    def test_large_modulus(self):
+        s = span.SuperNumberSpan([SuperNumber(3, 10 ** 6, 7)])
+        self.assertEqual(len(s), len(set(s.as_array())))
+        self.assertIn(SuperNumber(3, 10 ** 6, 7) * SuperNumber(3, 10 ** 6, 7), s)
+
+
+class SuperNumberProductTests(unittest.TestCase):
+    def naive(self, sns):
+        product = sns[0]
+        for sn in sns[1:]:
+            product = product * sn
+        return product
+
+    def test_product(self):
+        for n, alpha in [(1, 0), (12, 3), (10**12, 10), (10**30, 6)]:
+            sns = [SuperNumber(x * 7919 % n, n, alpha) for x in range(1, 300)]
+            expected = self.naive(sns)
+            for processes in [1, 2]:
+                self.assertEqual(
+                    expected,
+                    fold.SuperNumberProduct(sns, processes=processes, chunksize=16),
+                )
+
+    def test_start(self):
+        sns = [SuperNumber(x, 10, 4) for x in range(1, 10)]
+        start = SuperNumber(3, 10, 4)
+        self.assertEqual(self.naive([start] + sns), fold.SuperNumberProduct(sns, start))
+        self.assertEqual(start, fold.SuperNumberProduct([], start))
+        with self.assertRaises(ValueError):
+            fold.SuperNumberProduct([])
+
+    def test_mismatched(self):
+        with self.assertRaises(Exception):
+            fold.SuperNumberProduct([SuperNumber(1, 10, 4), SuperNumber(1, 10, 3)])
+
+    def test_absorbing_element(self):
+        self.assertEqual(2, fold.AbsorbingElement(7, 3))
+        self.assertIsNone(fold.AbsorbingElement(12, 3))
+        z = SuperNumber(fold.AbsorbingElement(10**30 + 1, 7), 10**30 + 1, 7)
+        self.assertEqual(z, z * SuperNumber(12345, 10**30 + 1, 7))
+
+    def test_short_circuits(self):
+        def stream():
+            yield SuperNumber(5, 7, 3)
+            yield SuperNumber(2, 7, 3)
+            while True:
+                yield SuperNumber(5, 7, 3)
+
+        # An endless stream, which only ends because 2 is absorbing
+        self.assertEqual(SuperNumber(2, 7, 3), fold.SuperNumberProduct(stream()))
+        self.assertEqual(
+            SuperNumber(2, 7, 3), fold.SuperNumberProduct(stream(), processes=2)
+        )
+
+    @staticmethod
+    def add(x, y, mod, mult):
+        return (x + y) % mod
+
+    @staticmethod
+    def largest(x, y, mod, mult):
+        return np.maximum(x, y)
+
+    def test_fold(self):
+        sns = [SuperNumber(x * 7919 % 1000, 1000, 3) for x in range(1, 300)]
+        expected = SuperNumber(sum(sn.object for sn in sns) % 1000, 1000, 3)
+        for processes in [1, 2]:
+            self.assertEqual(
+                expected,
+                fold.SuperNumberFold(self.add, sns, processes=processes, chunksize=16),
+            )
+        with self.assertRaises(ValueError):
+            fold.SuperNumberFold(self.add, [])
+
+    def test_fold_short_circuits(self):
+        def stream():
+            yield SuperNumber(5, 7, 3)
+            yield SuperNumber(6, 7, 3)
+            while True:
+                yield SuperNumber(1, 7, 3)
+
+        for processes in [1, 2]:
+            self.assertEqual(
+                SuperNumber(6, 7, 3),
+                fold.SuperNumberFold(
+                    self.largest, stream(), absorbing=6, processes=processes
+                ),
+            )
+
+
+class SubsemigroupsTests(unittest.TestCase):
+    def brute_force(self, n, alpha):
+        # Every subset closed under multiplication
+        found = set()
+        for mask in range(1, 2 ** n):
+            elements = [x for x in range(n) if mask >> x & 1]
+            if all(
+                mask >> (SuperNumber(x, n, alpha) * SuperNumber(y, n, alpha)).object & 1
+                for x in elements
+                for y in elements
+            ):
+                found.add(mask)
+        return found
+
+    def test_every_subsemigroup_once(self):
+        for n in range(1, 8):
+            for alpha in range(n):
+                masks = [s.bitmask for s in lattice.Subsemigroups(n, alpha)]
+                self.assertEqual(len(masks), len(set(masks)))
+                self.assertEqual(set(masks), self.brute_force(n, alpha))
+
+    def test_generators(self):
+        for s in lattice.Subsemigroups(12, 3):
+            generators = {SuperNumber(x, 12, 3) for x in s.generators}
+            self.assertEqual(span.SuperNumberSpan(generators).as_set(), s.as_set())
+            for x in generators:
+                if len(generators) > 1:
+                    smaller = span.SuperNumberSpan(generators - {x}).as_set()
+                    self.assertNotEqual(smaller, s.as_set())
+
+    def test_covers(self):
+        n, alpha = 6, 2
+        all_masks = self.brute_force(n, alpha)
+        for s in lattice.Subsemigroups(n, alpha):
+            above = {m for m in all_masks if m & s.bitmask == s.bitmask} - {s.bitmask}
+            expected = {
+                m for m in above if not any(o != m and o & m == o for o in above)
+            }
+            self.assertEqual(set(s.covers), expected)
+
+    def test_str(self):
+        first = next(lattice.Subsemigroups(3, 0))
+        self.assertEqual(str(first), "<Subsemigroup [0] generated by [0] mod 3 | 0>")
+
+
+class PrimesTests(unittest.TestCase):
+    def test_is_prime(self):
+        expected = [2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37, 41, 43, 47]
+        self.assertEqual([p for p in range(50) if primes.IsPrime(p)], expected)
+        self.assertTrue(primes.IsPrime(2 ** 61 - 1))
+        self.assertFalse(primes.IsPrime(3215031751))
+
+    def test_factorize(self):
+        self.assertEqual(primes.Factorize(1), {})
+        self.assertEqual(primes.Factorize(360), {2: 3, 3: 2, 5: 1})
+        self.assertEqual(
+            primes.Factorize(600851475143), {71: 1, 839: 1, 1471: 1, 6857: 1}
+        )
+        self.assertEqual(
+            primes.Factorize((10 ** 6 + 3) ** 2 * 43), {43: 1, 10 ** 6 + 3: 2}
+        )
+
+    def test_factorize_not_int(self):
+        with self.assertRaisesRegex(TypeError, "Num is not an int"):
+            primes.Factorize(2.0)
+
+    def test_factorize_not_positive(self):
+        with self.assertRaisesRegex(Exception, "Num is not greater than zero"):
+            primes.Factorize(0)
+
+
+class CongruenceTests(unittest.TestCase):
+    def test_solve(self):
+        for n in range(1, 40):
+            for a, b, c in [(1, 0, -1), (3, 2, 5), (0, 4, 2), (6, 0, 0), (5, 5, 5)]:
+                expected = [x for x in range(n) if (a * x * x + b * x + c) % n == 0]
+                self.assertEqual(
+                    congruence.SolveQuadraticCongruence(a, b, c, n), expected
+                )
+
+    def test_combine_residues(self):
+        combined = congruence.CombineResidues([[1, 2], [0, 3]], [3, 4])
+        self.assertEqual([4, 7, 8, 11], sorted(combined))
+
+    def test_super_roots_of_one(self):
+        for n in range(1, 60):
+            for alpha in range(n):
+                congruence.SuperRootsOfOne(n, alpha, validate=True)
+
+    def test_idempotent_property(self):
+        for n in range(1, 60):
+            for alpha in range(n):
+                congruence.HasSuperNumberIdempotentProperty(n, alpha, validate=True)
+
+    def test_idempotents(self):
+        for n in range(1, 30):
+            for alpha in range(n):
+                self.assertEqual(
+                    congruence.SuperNumberIdempotents(n, alpha),
+                    [x for x in SuperNumbers(n, alpha) if x * x == x],
+                )
+
+    def test_square_roots(self):
+        self.assertEqual(
+            congruence.SuperNumberSquareRoots(13, 2, SuperNumber(1, 13, 2)),
+            [SuperNumber(4, 13, 2), SuperNumber(8, 13, 2)],
+        )
+
+    def test_huge_modulus(self):
+        n = 10 ** 12
+        roots = congruence.SuperRootsOfOne(n, 3)
+        self.assertEqual(len(roots), 16)
+        for x in roots:
+            self.assertEqual(x * x, SuperNumber(1, n, 3))
+
+
+class SemigroupStructureTests(unittest.TestCase):
+    def test_validate(self):
+        for n in range(1, 25):
+            for alpha in range(n):
+                structure.AnalyzeSemigroup(n, alpha, validate=True)
+
+    def test_structure(self):
+        s = structure.AnalyzeSemigroup(12, 3)
+        self.assertEqual([0, 2, 4, 6, 8, 10], s.units.tolist())
+        self.assertEqual([0, 9], s.idempotents.tolist())
+        self.assertEqual(
+            {0: [0, 2, 4, 6, 8, 10], 9: [1, 5, 9]},
+            {e: g.tolist() for e, g in s.subgroups.items()},
+        )
+        self.assertEqual(range(1, 12, 2), s.principal_ideal(7))
+        self.assertEqual(3, len(s.principal_ideals()))
+
+    def test_answers_properties(self):
+        for n, alpha in [(1, 0), (2, 1), (3, 1), (13, 2), (10, 3)]:
+            s = structure.AnalyzeSemigroup(n, alpha)
+            self.assertEqual(
+                props.HasSuperNumberIdempotentProperty(n, alpha),
+                s.has_idempotent_property(),
+            )
+            self.assertEqual(
+                [x.object for x in props.SuperRootsOfOne(n, alpha)],
+                s.roots_of_one.tolist(),
+            )
+            self.assertTrue(s.is_commutative and s.is_associative)
+
+    def test_group(self):
+        # With alpha = 0, multiplication is addition mod n
+        s = structure.AnalyzeSemigroup(6, 0)
+        self.assertEqual(list(range(6)), s.units.tolist())
+        self.assertEqual(
+            {0: list(range(6))}, {e: g.tolist() for e, g in s.subgroups.items()}
+        )
+
+
+class CRTTests(unittest.TestCase):
+    def test_agrees_with_props(self):
+        engine = crt.CRTEngine(props="props")
+        for n in range(1, 37):
+            for alpha in range(n):
+                for name in [
+                    "HasSuperNumberIdempotentProperty",
+                    "IsCommutativeSuperNumberMultiplication",
+                    "SuperRootsOfOne",
+                ]:
+                    self.assertEqual(
+                        getattr(props, name)(n, alpha), getattr(engine, name)(n, alpha)
+                    )
+                self.assertEqual(
+                    len(props.SuperRootsOfOne(n, alpha)),
+                    engine.CountSuperRootsOfOne(n, alpha),
+                )
+
+    def test_reuses_prime_powers(self):
+        engine = crt.CRTEngine()
+        engine.IsAssociativeSuperNumberMultiplication(12, 5)
+        self.assertEqual((0, 2), (engine.hits, engine.misses))
+        # 36 = 4 * 9, and 5 ≡ 41 (mod 4)
+        engine.IsAssociativeSuperNumberMultiplication(36, 41)
+        self.assertEqual((1, 3), (engine.hits, engine.misses))
+
+    def test_large_n(self):
+        # Only the prime powers 2^7, 3^5 and 101 are ever worked out
+        n = 2**7 * 3**5 * 101
+        self.assertTrue(crt.IsAssociativeSuperNumberMultiplication(n, 7))
+        self.assertEqual(congruence.SuperRootsOfOne(n, 7), crt.SuperRootsOfOne(n, 7))
+
+    def test_sweep(self):
+        grid = sweep.Grid(range(1, 13))
+        key = lambda result: (result["property"], result["n"], result["alpha"])
+        self.assertEqual(
+            sorted(sweep.Sweep(grid, processes=1), key=key),
+            sorted(sweep.Sweep(grid, processes=1, props="crt"), key=key),
+        )
+
+
+class SweepTests(unittest.TestCase):
+    def test_grid(self):
+        self.assertEqual(sweep.Grid([1, 3]), [(1, 0), (3, 0), (3, 1), (3, 2)])
+        self.assertEqual(sweep.Grid([1, 3], [1, 2]), [(3, 1), (3, 2)])
+
+    def expected(self, grid):
+        return sorted(
+            (name, n, alpha, props.__dict__[name](n, alpha))
+            for n, alpha in grid
+            for name in sweep.PROPERTIES
+        )
+
+    def results(self, grid, processes):
+        return sorted(
+            (
+                r["property"],
+                r["n"],
+                r["alpha"],
+                [SuperNumber(x, r["n"], r["alpha"]) for x in r["result"]]
+                if isinstance(r["result"], list)
+                else r["result"],
+            )
+            for r in sweep.Sweep(grid, processes=processes)
+        )
+
+    def test_sweep_in_process(self):
+        grid = sweep.Grid(range(1, 8))
+        self.assertEqual(self.expected(grid), self.results(grid, 1))
+
+    def test_sweep_in_pool(self):
+        grid = sweep.Grid(range(1, 8))
+        self.assertEqual(self.expected(grid), self.results(grid, 2))
+
+    def test_unknown_property(self):
+        with self.assertRaises(ValueError):
+            list(sweep.Sweep([(3, 1)], properties=["IsCyclic"]))
+
+
+class ResultsStoreTests(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.store = ResultsStore(self.directory.name)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_verdicts_persist(self):
+        result = {"property": "SuperRootsOfOne", "n": 3, "alpha": 2, "result": [1]}
+        self.store.put(result)
+        reopened = ResultsStore(self.directory.name)
+        self.assertIn(("SuperRootsOfOne", 3, 2), reopened)
+        self.assertEqual(reopened.get("SuperRootsOfOne", 3, 2), result)
+        self.assertIsNone(reopened.get("SuperRootsOfOne", 3, 1))
+        self.assertEqual(len(reopened), 1)
+
+    def test_ignores_partial_line(self):
+        result = {"property": "SuperRootsOfOne", "n": 3, "alpha": 2, "result": [1]}
+        self.store.put(result)
+        with open(os.path.join(self.directory.name, "verdicts.jsonl"), "a") as f:
+            f.write('{"property": "SuperRo')
+        store = ResultsStore(self.directory.name)
+        self.assertEqual(len(store), 1)
+
+        # A verdict written after resuming isn't lost to the partial line.
+        store.put(dict(result, n=5))
+        self.assertEqual(len(ResultsStore(self.directory.name)), 2)
+
+    def test_table(self):
+        table = self.store.table(37, 5)
+        self.assertTrue((table.table == CayleyTable(37, 5).table).all())
+        self.assertEqual(
+            table.product(SuperNumber(3, 37, 5), SuperNumber(4, 37, 5)),
+            SuperNumber(3, 37, 5) * SuperNumber(4, 37, 5),
+        )
+        # Read back from the file the second time
+        again = self.store.table(37, 5)
+        self.assertEqual([row.tolist() for row in again.table], table.table.tolist())
+
+    def test_table_written_in_blocks(self):
+        table = np.zeros((10, 10), dtype=np.int64)
+        FillTable(table, 10, 3, rows=3)
+        self.assertTrue((table == CayleyTable(10, 3).table).all())
+
+    def test_resume_sweep(self):
+        grid = sweep.Grid(range(1, 6))
+        first = sweep.Sweep(grid, processes=1, store=self.store)
+        partial = [next(first) for _ in range(10)]
+        first.close()
+        self.assertEqual(len(self.store), 10)
+
+        resumed = list(sweep.Sweep(grid, processes=1, store=self.store))
+        self.assertEqual(resumed[:10], partial)
+        self.assertEqual(len(resumed), len(self.store))
+
+        # Now everything is stored, nothing should be computed again.
+        with mock.patch.object(sweep, "EvaluateCell", side_effect=AssertionError):
+            again = list(sweep.Sweep(grid, processes=1, store=self.store))
+        self.assertEqual(sorted(map(str, again)), sorted(map(str, resumed)))
+
+    def test_props_on_stored_table(self):
+        for n, alpha in [(12, 5), (13, 3), (16, 4)]:
+            table = self.store.table(n, alpha)
+            for name in sweep.PROPERTIES:
+                self.assertEqual(
+                    getattr(props_table, name)(n, alpha, table=table),
+                    getattr(props, name)(n, alpha),
+                )
+        with self.assertRaises(ValueError):
+            props_table.SuperRootsOfOne(12, 4, table=self.store.table(12, 5))
+
+    def test_sweep_on_stored_tables(self):
+        grid = sweep.Grid(range(1, 8))
+        with mock.patch.object(props_table, "CayleyTable") as built, mock.patch.object(
+            associativity, "CayleyTable"
+        ) as built_for_light:
+            results = list(
+                sweep.Sweep(grid, processes=1, store=self.store, tables=True)
+            )
+        built.assert_not_called()
+        built_for_light.assert_not_called()
+        self.assertEqual(
+            sorted(map(json.dumps, results)),
+            sorted(map(json.dumps, sweep.Sweep(grid, processes=1))),
+        )
+        self.assertTrue(
+            os.path.exists(os.path.join(self.directory.name, "tables", "7_3.npy"))
+        )
+        with self.assertRaises(ValueError):
+            list(sweep.Sweep(grid, tables=True))
+
+
+class BenchmarksTests(unittest.TestCase):
+    def test_names(self):
+        names = benchmarks.Benchmarks(sizes=(5,))
+        self.assertIn("core.multiply[n=5]", names)
+        self.assertIn("props_checked.SuperRootsOfOne[n=5]", names)
+        self.assertIn("span.SuperNumberSetSpan[n=5]", names)
+
+    def test_benchmarks_run(self):
+        for fn in benchmarks.Benchmarks(sizes=(5,)).values():
+            fn()
+
+    def test_run(self):
+        results = benchmarks.RunBenchmarks(sizes=(5,), pattern="multiply", repeat=1)
+        self.assertEqual(list(results["results"]), ["core.multiply[n=5]"])
+
+    def test_compare(self):
+        before = {"results": {"a": 1.0, "b": 1.0, "c": 1.0}}
+        after = {"results": {"a": 1.05, "b": 1.5, "d": 3.0}}
+        self.assertEqual(
+            benchmarks.CompareBenchmarks(before, after, threshold=0.1),
+            [("b", 1.0, 1.5, 1.5)],
+        )
+
+
+class InstrumentationTests(unittest.TestCase):
+    def test_counts(self):
+        x = SuperNumber(2, 13, 2)
+        with Instrumentation() as instrumentation:
+            x * x * x
+            SuperNumber(1, 13, 2)
+            list(SuperNumbers(4, 1))
+        self.assertEqual(instrumentation.multiplications, 2)
+        self.assertEqual(instrumentation.instances, 7)
+
+    def test_span_rounds(self):
+        span.ClearSpanCache()
+        with Instrumentation() as instrumentation:
+            span.SuperNumberSetSpan({SuperNumber(4, 13, 2)})
+        # {4} -> {1} -> {0} -> {}
+        self.assertEqual(instrumentation.span_rounds, 3)
+
+    def test_property_timing(self):
+        memo.SetMemoCache()
+        with Instrumentation() as instrumentation:
+            props_checked.SuperRootsOfOne(5, 3)
+            props_checked.SuperRootsOfOne(5, 3)
+            props.SuperRootsOfOne(7, 3)
+        report = instrumentation.report()
+        calls = {label: stats["calls"] for label, stats in report["properties"].items()}
+        self.assertEqual(calls["props_checked.SuperRootsOfOne"], 2)
+        # Including the call props_checked made; the second was answered by
+        # the memo cache
+        self.assertEqual(calls["props.SuperRootsOfOne"], 2)
+        self.assertEqual(
+            [(cell["n"], cell["alpha"]) for cell in report["cells"]], [(5, 3), (7, 3)]
+        )
+
+    def test_restores_originals(self):
+        mul = SuperNumber.__mul__
+        fn = props_checked.SuperRootsOfOne
+        with Instrumentation():
+            self.assertIsNot(SuperNumber.__mul__, mul)
+            self.assertIsNot(props_checked.SuperRootsOfOne, fn)
+        self.assertIs(SuperNumber.__mul__, mul)
+        self.assertIs(props_checked.SuperRootsOfOne, fn)
+        x = SuperNumber(1, 3, 0)
+        self.assertEqual(x * x, SuperNumber(2, 3, 0))
+
+    def test_not_nested(self):
+        with Instrumentation():
+            with self.assertRaisesRegex(Exception, "already active"):
+                with Instrumentation():
+                    pass
+
+    def test_json(self):
+        with Instrumentation() as instrumentation:
+            props.SuperRootsOfOne(3, 2)
+        stream = io.StringIO()
+        instrumentation.write_json(stream)
+        self.assertEqual(json.loads(stream.getvalue())["cells"][0]["n"], 3)
+
+
+class SearchTests(unittest.TestCase):
+    def test_commutative(self):
+        for processes in [1, 2]:
+            result = search.FindCommutativityCounterexample(30, 7, processes)
+            self.assertIsInstance(result, search.SearchSummary)
+            self.assertEqual(result.checked, 30 * 29 // 2)
+
+    def test_associative(self):
+        for processes in [1, 2]:
+            result = search.FindAssociativityCounterexample(30, 7, processes, shards=4)
+            self.assertIsInstance(result, search.SearchSummary)
+            self.assertEqual((result.checked, result.shards), (30 ** 3, 4))
+
+    # x + 2y is neither commutative nor associative
+    @mock.patch.object(search, "MultiplyValues", lambda x, y, n, alpha: (x + 2 * y) % n)
+    def test_counterexamples(self):
+        for processes in [1, 2]:
+            result = search.FindCommutativityCounterexample(30, 7, processes)
+            self.assertIsInstance(result, search.Counterexample)
+            x, y = result.values
+            self.assertNotEqual((x + 2 * y) % 30, (y + 2 * x) % 30)
+
+            result = search.FindAssociativityCounterexample(30, 7, processes)
+            self.assertIsInstance(result, search.Counterexample)
+            x, y, z = result.values
+            self.assertNotEqual(
+                ((x + 2 * y) % 30 + 2 * z) % 30, (x + 2 * ((y + 2 * z) % 30)) % 30
+            )
+
+
+class QueryServerTests(unittest.TestCase):
+    def test_query_caches(self):
+        async def run():
+            qs = server.QueryServer(processes=1)
+            first = await qs.query("SuperRootsOfOne", 10, 13)
+            second = await qs.query("SuperRootsOfOne", 10, 3)
+            return qs, first, second
+
+        qs, first, second = asyncio.run(run())
+        self.assertEqual([7, 9], first)
+        self.assertEqual(first, second)
+        self.assertEqual((1, 1), (qs.misses, qs.hits))
+
+    def test_query_coalesces(self):
+        async def run():
+            qs = server.QueryServer(processes=1, inline_below=0)
+            results = await asyncio.gather(
+                *[
+                    qs.query("IsAssociativeSuperNumberMultiplication", 12, 5)
+                    for _ in range(5)
+                ]
+            )
+            return qs, results
+
+        with mock.patch.object(server, "_compute", return_value=True) as compute:
+            qs, results = asyncio.run(run())
+        self.assertEqual([True] * 5, results)
+        self.assertEqual(1, compute.call_count)
+        self.assertEqual((1, 4), (qs.misses, qs.coalesced))
+
+    def test_inline_only_when_cheap(self):
+        qs = server.QueryServer(processes=1)
+        self.assertTrue(qs._inline("SuperRootsOfOne", 2500))
+        self.assertFalse(qs._inline("SuperNumberSetSpan", 2500))
+        self.assertFalse(qs._inline("IsCommutativeSuperNumberMultiplication", 2500))
+        self.assertTrue(qs._inline("SuperNumberSetSpan", 50))
+
+    def test_query_errors(self):
+        async def run(*args):
+            return await server.QueryServer(processes=1).query(*args)
+
+        with self.assertRaises(ValueError):
+            asyncio.run(run("IsCyclic", 10, 3))
+        with self.assertRaises(ValueError):
+            asyncio.run(run("SuperRootsOfOne", 0, 3))
+        with self.assertRaises(ValueError):
+            asyncio.run(run("SuperNumberSetSpan", 10, 3, []))
+
+    def test_client(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "supernumber.sock")
+            loop = asyncio.new_event_loop()
+            qs = server.QueryServer(processes=1)
+            loop.run_until_complete(qs.start(path))
+            thread = threading.Thread(target=loop.run_forever)
+            thread.start()
+            try:
+                with QueryClient(path) as client:
+                    self.assertEqual(
+                        props.SuperRootsOfOne(13, 2), client.SuperRootsOfOne(13, 2)
+                    )
+                    self.assertTrue(client.IsCommutativeSuperNumberMultiplication(6, 1))
+                    generators = {SuperNumber(4, 13, 2)}
+                    self.assertEqual(
+                        span.SuperNumberSetSpan(generators),
+                        client.SuperNumberSetSpan(generators),
+                    )
+                    with self.assertRaises(Exception):
+                        client.call("IsCyclic", 6, 1)
+                    with self.assertRaises(ValueError):
+                        client.SuperNumberSetSpan(set())
+                    with self.assertRaises(ValueError):
+                        client.SuperNumberSetSpan(
+                            {SuperNumber(4, 13, 2), SuperNumber(4, 13, 3)}
+                        )
+                    self.assertEqual(3, client.stats()["misses"])
+            finally:
+                asyncio.run_coroutine_threadsafe(qs.close(), loop).result()
+                loop.call_soon_threadsafe(loop.stop)
+                thread.join()
+                loop.close()
+
 if __name__ == "__main__":
     unittest.main()
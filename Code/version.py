@@ -0,0 +1,7 @@
+"""
+The version of the SuperNumbers library. It's part of the key results are
+remembered under by memo, so it should be bumped whenever a change could alter
+the answer a property function gives.
+"""
+
+__version__ = "0.1.0"